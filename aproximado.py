@@ -0,0 +1,139 @@
+class AproximadorAFN:
+    """Coincidencia aproximada (Wu–Manber) sobre un AFN de Thompson.
+
+    Cada conjunto de estados es un entero con un bit por estado, y hay una fila por
+    nivel de error d = 0..k. Con el carácter c, la fila d pasa a ser la ε-clausura de:
+        avanzar(R[d], c)            coincidencia
+        R[d-1]                      inserción (c sobra en la entrada)
+        avanzar_cualquiera(R[d-1])  sustitución
+        avanzar_cualquiera(R'[d-1]) borrado (falta un símbolo en la entrada)
+    Las operaciones sobre conjuntos usan tablas por bloques de 8 bits, así que cada
+    paso cuesta O(k · m/8) consultas y el total es lineal en la longitud de la entrada.
+    """
+    BITS_BLOQUE = 8
+
+    def __init__(self, afn):
+        if afn.transiciones_contador:
+            raise ValueError("AFN con contadores: construya sin modo_contador")
+
+        estados = sorted(afn.states, key=lambda e: e.id)
+        indice = {estado: i for i, estado in enumerate(estados)}
+        self.num_estados = len(estados)
+        self.inicio = 1 << indice[afn.start_state]
+        self.finales = sum(1 << indice[e] for e in afn.final_states)
+
+        clausuras = []
+        for estado in estados:
+            clausuras.append(sum(1 << indice[e] for e in afn.epsilon_closure({estado})))
+
+        sucesores = {}   # símbolo -> [máscara de destinos por estado]
+        for origen, simbolos in afn.transitions.items():
+            for simbolo, destinos in simbolos.items():
+                if simbolo == '#':
+                    continue
+                fila = sucesores.setdefault(simbolo, [0] * self.num_estados)
+                fila[indice[origen]] |= sum(1 << indice[d] for d in destinos)
+
+        cualquiera = [0] * self.num_estados
+        for fila in sucesores.values():
+            for s, mascara in enumerate(fila):
+                cualquiera[s] |= mascara
+
+        self.tabla_clausura = self.tablas_por_bloque(clausuras)
+        self.tabla_cualquiera = self.tablas_por_bloque(cualquiera)
+        self.tablas_simbolo = {simbolo: self.tablas_por_bloque(fila) for simbolo, fila in sucesores.items()}
+
+    def tablas_por_bloque(self, por_estado):
+        """Para cada bloque de 8 estados, la unión de imágenes de cada uno de sus 256 subconjuntos"""
+        tablas = []
+        for base in range(0, self.num_estados, self.BITS_BLOQUE):
+            imagenes = por_estado[base:base + self.BITS_BLOQUE]
+            tabla = [0] * (1 << self.BITS_BLOQUE)
+            for subconjunto in range(1, 1 << len(imagenes)):
+                bajo = subconjunto & -subconjunto
+                tabla[subconjunto] = tabla[subconjunto ^ bajo] | imagenes[bajo.bit_length() - 1]
+            tablas.append(tabla)
+        return tablas
+
+    @staticmethod
+    def aplicar(tablas, mascara):
+        resultado = 0
+        bloque = 0
+        while mascara:
+            if mascara & 0xFF:
+                resultado |= tablas[bloque][mascara & 0xFF]
+            mascara >>= 8
+            bloque += 1
+        return resultado
+
+    def filas_finales(self, cadena, k):
+        """Filas R[0..k] tras consumir toda la cadena"""
+        aplicar = self.aplicar
+        clausura = self.tabla_clausura
+        cualquiera = self.tabla_cualquiera
+
+        filas = [aplicar(clausura, self.inicio)]
+        for _ in range(k):
+            anterior = filas[-1]
+            filas.append(anterior | aplicar(clausura, aplicar(cualquiera, anterior)))
+
+        for c in cadena:
+            por_simbolo = self.tablas_simbolo.get(c)
+            nuevas = []
+            previa_vieja = 0
+            previa_nueva = 0
+            for d, fila in enumerate(filas):
+                siguiente = aplicar(por_simbolo, fila) if por_simbolo is not None else 0
+                if d:
+                    siguiente |= previa_vieja | aplicar(cualquiera, previa_vieja | previa_nueva)
+                siguiente = aplicar(clausura, siguiente)
+                nuevas.append(siguiente)
+                previa_vieja, previa_nueva = fila, siguiente
+            filas = nuevas
+            if not filas[-1]:
+                # Ni con k errores queda algún estado activo
+                break
+        return filas
+
+    def distancia_minima(self, cadena, k):
+        """Menor cantidad de ediciones (≤ k) para que la cadena sea aceptada, o None"""
+        for d, fila in enumerate(self.filas_finales(cadena, k)):
+            if fila & self.finales:
+                return d
+        return None
+
+    def acepta(self, cadena, k):
+        return self.distancia_minima(cadena, k) is not None
+
+
+def test_aproximado():
+    """Distancias de edición frente al AFN y tiempo lineal en la longitud de la entrada"""
+    import io
+    import time
+    from contextlib import redirect_stdout
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+
+    def construir(regex):
+        with redirect_stdout(io.StringIO()):
+            return AproximadorAFN(Thompson().construir_desde_postfix(infix_to_postfix(regex)))
+
+    print("=== COINCIDENCIA APROXIMADA ===")
+    casos = [("(a|b)*abb", "aab", 2), ("(a|b)*abb", "abbc", 2),
+             (r"if\((a|x|t)+\)\{y\}(else\{n\})?", "if(a){y}els{n}", 3),
+             (r"if\((a|x|t)+\)\{y\}(else\{n\})?", "fi(a){y}", 3), ("hola", "ola", 1), ("hola", "xyz", 2)]
+    for regex, cadena, k in casos:
+        distancia = construir(regex).distancia_minima(cadena, k)
+        print(f"  {regex} ~ '{cadena}' (k={k}): {distancia if distancia is not None else 'más de k'}")
+
+    aproximador = construir("(a|b)*abb(a|b)*")
+    print("\n  (a|b)*abb(a|b)* sobre (ab)^n, k=2:")
+    for n in (1000, 10000, 100000):
+        cadena = 'ab' * (n // 2)
+        inicio = time.perf_counter()
+        distancia = aproximador.distancia_minima(cadena, 2)
+        print(f"    n={n:<7} distancia={distancia}  {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    test_aproximado()
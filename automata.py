@@ -1,5 +1,3 @@
-import networkx as nx
-import matplotlib.pyplot as plt
 from collections import defaultdict
 
 
@@ -25,6 +23,15 @@ class AFN:
         self.start_state = None
         self.final_states = set()
         self.state_counter = 0
+        # Transiciones ε con operación de contador (repeticiones {m,n} en modo contador)
+        self.transiciones_contador = defaultdict(list)
+        self.num_contadores = 0
+        # Destinos ε en orden de inserción (prioridad para la simulación con capturas)
+        # y etiquetas de grupo: (origen, destino) -> ranura de captura
+        self.orden_epsilon = defaultdict(list)
+        self.etiquetas = {}
+        # Grupos que vio el parser, aunque alguno no deje etiquetas (p. ej. bajo {0,0})
+        self.num_grupos = 0
 
     def crear_estado(self, is_final=False):
         e = Estado(self.state_counter)
@@ -36,8 +43,20 @@ class AFN:
         return e
 
     def agregar_transicion(self, from_state, to_state, symbol):
+        if symbol == '#' and to_state not in self.transitions[from_state]['#']:
+            self.orden_epsilon[from_state].append(to_state)
         self.transitions[from_state][symbol].add(to_state)
 
+    def agregar_transicion_etiqueta(self, from_state, to_state, ranura):
+        """Transición ε que guarda la posición actual en la ranura de captura indicada"""
+        self.agregar_transicion(from_state, to_state, '#')
+        self.etiquetas[(from_state, to_state)] = ranura
+
+    def agregar_transicion_contador(self, from_state, to_state, accion, contador, minimo, maximo):
+        """Transición ε que reinicia, incrementa ('repetir') o libera ('salir') un contador"""
+        self.transiciones_contador[from_state].append((to_state, accion, contador, minimo, maximo))
+        self.num_contadores = max(self.num_contadores, contador + 1)
+
     def epsilon_closure(self, estados):
         """Calcula la epsilon clausura de un conjunto de estados"""
         if not estados:
@@ -73,11 +92,80 @@ class AFN:
         result = self.epsilon_closure(next_states) if next_states else set()
         return result
 
+    def aplicar_contador(self, contadores, accion, contador, minimo, maximo):
+        """Devuelve los contadores tras la operación, o None si la transición no está permitida"""
+        valores = list(contadores)
+        if accion == 'reiniciar':
+            valores[contador] = 0
+            return tuple(valores)
+
+        completadas = valores[contador] + 1
+        if accion == 'repetir':
+            if maximo is not None and completadas >= maximo:
+                return None
+            # Sin cota superior basta recordar hasta el mínimo
+            valores[contador] = completadas if maximo is not None else min(completadas, minimo)
+            return tuple(valores)
+
+        # 'salir'
+        if completadas < minimo:
+            return None
+        valores[contador] = None
+        return tuple(valores)
+
+    def epsilon_closure_contadores(self, configuraciones):
+        """ε-clausura sobre configuraciones (estado, contadores)"""
+        closure = set(configuraciones)
+        stack = list(configuraciones)
+
+        while stack:
+            estado, contadores = stack.pop()
+            siguientes = [(destino, contadores) for destino in self.transitions[estado].get('#', ())]
+            for destino, accion, contador, minimo, maximo in self.transiciones_contador.get(estado, ()):
+                nuevos = self.aplicar_contador(contadores, accion, contador, minimo, maximo)
+                if nuevos is not None:
+                    siguientes.append((destino, nuevos))
+
+            for configuracion in siguientes:
+                if configuracion not in closure:
+                    closure.add(configuracion)
+                    stack.append(configuracion)
+        return closure
+
+    def simular_contadores(self, cadena):
+        """Simula la cadena llevando un valor por contador en cada configuración"""
+        if not self.start_state:
+            return False
+
+        inicial = (self.start_state, (None,) * self.num_contadores)
+        current = self.epsilon_closure_contadores({inicial})
+        print(f"Simulación AFN con contadores: {len(current)} configuraciones iniciales")
+
+        for i, simbolo in enumerate(cadena):
+            siguientes = set()
+            for estado, contadores in current:
+                for destino in self.transitions[estado].get(simbolo, ()):
+                    siguientes.add((destino, contadores))
+
+            if not siguientes:
+                print(f"  No hay transiciones válidas para '{simbolo}' (posición {i}) - RECHAZA")
+                return False
+
+            current = self.epsilon_closure_contadores(siguientes)
+
+        acepta = any(estado in self.final_states for estado, _ in current)
+        print(f"  Configuraciones finales: {len(current)}")
+        print(f"  Resultado: {'ACEPTA' if acepta else 'RECHAZA'}")
+        return acepta
+
     def simular(self, cadena):
         """Simula la cadena en el AFN"""
         if not self.start_state:
             return False
 
+        if self.transiciones_contador:
+            return self.simular_contadores(cadena)
+
         # Estado inicial con epsilon closure
         current_states = self.epsilon_closure({self.start_state})
         print(f"Simulación AFN: estado inicial {[str(s) for s in current_states]}")
@@ -117,6 +205,12 @@ class AFN:
                 disp = 'ε' if simbolo == '#' else simbolo
                 for d in destinos:
                     print(f"  {origen} --{disp}--> {d}")
+        for origen, operaciones in self.transiciones_contador.items():
+            for destino, accion, contador, minimo, maximo in operaciones:
+                cota = '∞' if maximo is None else maximo
+                print(f"  {origen} --ε[{accion} c{contador} {{{minimo},{cota}}}]--> {destino}")
+        for (origen, destino), ranura in self.etiquetas.items():
+            print(f"  {origen} --ε[ranura {ranura}]--> {destino}")
 
     def visualizar(self, titulo="AFN"):
         import networkx as nx
@@ -200,6 +294,8 @@ class AFD:
         self.start_state = None
         self.final_states = set()
         self.alphabet = set()
+        # {(huella, modo, nombre): (fuente, función)} de los reconocedores de generador_codigo
+        self.codigo_generado = None
 
     def simular(self, cadena):
         """Simula la cadena en el AFD"""
@@ -0,0 +1,136 @@
+import os
+import json
+import time
+import zlib
+import hashlib
+import tempfile
+from eliminador_epsilon import Gramatica, EliminadorEpsilon, VERSION_ALGORITMO
+
+
+def texto_normalizado(gramatica):
+    """Texto canónico de la gramática: el orden de cuerpos y de líneas no cambia la clave"""
+    lineas = [f"inicial {gramatica.simbolo_inicial}"]
+    for nt in sorted(gramatica.producciones):
+        lineas.append(f"{nt} → {' | '.join(sorted(set(gramatica.producciones[nt])))}")
+    return '\n'.join(lineas)
+
+
+class CacheGramaticas:
+    """Caché en disco de resultados de EliminadorEpsilon indexada por contenido"""
+
+    EXTENSION = '.gz.json'
+    # Escrituras entre pasadas de desalojo (cada pasada lista el directorio)
+    INTERVALO_DESALOJO = 64
+
+    def __init__(self, directorio, max_bytes=256 * 1024 * 1024, max_edad=30 * 24 * 3600):
+        self.directorio = directorio
+        self.max_bytes = max_bytes
+        self.max_edad = max_edad
+        self.aciertos = 0
+        self.fallos = 0
+        self.escrituras = 0
+        os.makedirs(directorio, exist_ok=True)
+
+    def clave(self, gramatica, umbral_anulables=None):
+        contenido = f"v{VERSION_ALGORITMO}|umbral={umbral_anulables}\n{texto_normalizado(gramatica)}"
+        return hashlib.sha256(contenido.encode('utf-8')).hexdigest()
+
+    def ruta(self, clave):
+        return os.path.join(self.directorio, clave + self.EXTENSION)
+
+    def obtener(self, gramatica, umbral_anulables=None):
+        """Devuelve (gramatica_sin_epsilon, anulables) o None si no está en caché"""
+        ruta = self.ruta(self.clave(gramatica, umbral_anulables))
+        try:
+            with open(ruta, 'rb') as archivo:
+                datos = json.loads(zlib.decompress(archivo.read()).decode('utf-8'))
+        except (OSError, ValueError, zlib.error):
+            self.fallos += 1
+            return None
+
+        # Marca de uso reciente para la política de desalojo
+        try:
+            os.utime(ruta)
+        except OSError:
+            pass
+
+        resultado = Gramatica()
+        for nt, cuerpos in datos['producciones']:
+            for cuerpo in cuerpos:
+                resultado.agregar_produccion(nt, cuerpo)
+        resultado.simbolo_inicial = datos['simbolo_inicial']
+        # No terminales que quedaron sin producciones tras eliminar ε
+        resultado.no_terminales.update(datos.get('no_terminales', ()))
+
+        self.aciertos += 1
+        return resultado, set(datos['anulables'])
+
+    def guardar(self, gramatica, resultado, anulables, umbral_anulables=None):
+        datos = {
+            'version': VERSION_ALGORITMO,
+            'simbolo_inicial': resultado.simbolo_inicial,
+            'anulables': sorted(anulables),
+            'producciones': [[nt, cuerpos] for nt, cuerpos in resultado.producciones.items()],
+            'no_terminales': sorted(resultado.no_terminales),
+        }
+        comprimido = zlib.compress(json.dumps(datos, ensure_ascii=False, separators=(',', ':')).encode('utf-8'))
+
+        # Escritura atómica: archivo temporal en el mismo directorio y os.replace
+        descriptor, temporal = tempfile.mkstemp(dir=self.directorio, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as archivo:
+                archivo.write(comprimido)
+            os.replace(temporal, self.ruta(self.clave(gramatica, umbral_anulables)))
+        except BaseException:
+            if os.path.exists(temporal):
+                os.remove(temporal)
+            raise
+
+        self.escrituras += 1
+        if (self.escrituras - 1) % self.INTERVALO_DESALOJO == 0:
+            self.desalojar()
+
+    def desalojar(self):
+        """Borra entradas más viejas que max_edad y, si se excede max_bytes, las menos usadas"""
+        ahora = time.time()
+        entradas = []
+        for nombre in os.listdir(self.directorio):
+            if not nombre.endswith(self.EXTENSION):
+                continue
+            ruta = os.path.join(self.directorio, nombre)
+            try:
+                estado = os.stat(ruta)
+            except OSError:
+                continue
+            if ahora - estado.st_mtime > self.max_edad:
+                self._borrar(ruta)
+            else:
+                entradas.append((estado.st_mtime, estado.st_size, ruta))
+
+        total = sum(tamano for _, tamano, _ in entradas)
+        for _, tamano, ruta in sorted(entradas):
+            if total <= self.max_bytes:
+                break
+            self._borrar(ruta)
+            total -= tamano
+
+    def _borrar(self, ruta):
+        try:
+            os.remove(ruta)
+        except OSError:
+            pass
+
+    def eliminar_producciones_epsilon(self, gramatica, umbral_anulables=None):
+        """Como EliminadorEpsilon, pero un acierto no ejecuta el algoritmo.
+
+        Devuelve (gramatica_sin_epsilon, anulables, acierto).
+        """
+        en_cache = self.obtener(gramatica, umbral_anulables)
+        if en_cache is not None:
+            resultado, anulables = en_cache
+            return resultado, anulables, True
+
+        eliminador = EliminadorEpsilon(gramatica, umbral_anulables=umbral_anulables)
+        resultado = eliminador.eliminar_producciones_epsilon()
+        self.guardar(gramatica, resultado, eliminador.anulables, umbral_anulables)
+        return resultado, eliminador.anulables, False
@@ -0,0 +1,199 @@
+import io
+from contextlib import redirect_stdout
+from preprocesamiento import infix_to_postfix
+from thompson import Thompson
+
+
+def compilar_con_capturas(regex):
+    """AFN de Thompson con ε etiquetadas para cada grupo de la expresión"""
+    with redirect_stdout(io.StringIO()):
+        return Thompson().construir_desde_postfix(infix_to_postfix(regex, capturas=True))
+
+
+class MaquinaPike:
+    """Simulación de Pike sobre un AFN de Thompson: O(n·m) con ranuras de captura por hilo.
+
+    Los hilos se mantienen en orden de prioridad (las ε se siguen en su orden de
+    inserción), así que el primer hilo que acepta da la coincidencia leftmost-first.
+    Las ranuras 0 y 1 guardan la coincidencia completa; el grupo k usa 2k y 2k+1.
+    En bucles cuyo cuerpo acepta ε no se corta la iteración vacía como en re, así
+    que ahí los spans pueden diferir de los de un motor con retroceso.
+    """
+
+    def __init__(self, afn, prefiltro=None):
+        self.prefiltro = prefiltro
+        if afn.transiciones_contador:
+            raise ValueError("AFN con contadores: la máquina de Pike no los soporta")
+
+        # Estados como enteros 0..m-1 con listas planas por estado
+        estados = sorted(afn.states, key=lambda e: e.id)
+        indice = {estado: i for i, estado in enumerate(estados)}
+        self.inicio = indice[afn.start_state]
+        self.finales = [estado in afn.final_states for estado in estados]
+
+        # epsilon[i]: [(destino, ranura o None)] en orden de prioridad
+        self.epsilon = [[(indice[d], afn.etiquetas.get((e, d))) for d in afn.orden_epsilon.get(e, ())]
+                        for e in estados]
+        # simbolos[i]: {símbolo: [destinos]}
+        self.simbolos = [{s: [indice[d] for d in destinos]
+                          for s, destinos in afn.transitions.get(e, {}).items() if s != '#'}
+                         for e in estados]
+        self.num_grupos = max(afn.num_grupos, max(afn.etiquetas.values(), default=1) // 2)
+        self.num_ranuras = 2 * self.num_grupos + 2
+
+    def _agregar(self, lista, marcas, generacion, estado, ranuras, posicion, con_capturas):
+        """Agrega estado y su ε-clausura a lista en orden de prioridad (DFS con pila explícita)"""
+        pila = [(estado, ranuras)]
+        while pila:
+            estado, ranuras = pila.pop()
+            if marcas[estado] == generacion:
+                continue
+            marcas[estado] = generacion
+            lista.append((estado, ranuras))
+
+            # Se apilan al revés para visitar primero la ε de mayor prioridad
+            for destino, ranura in reversed(self.epsilon[estado]):
+                if marcas[destino] == generacion:
+                    continue
+                if ranura is not None and con_capturas:
+                    nuevas = list(ranuras)
+                    nuevas[ranura] = posicion
+                    pila.append((destino, tuple(nuevas)))
+                else:
+                    pila.append((destino, ranuras))
+
+    def ejecutar(self, cadena, anclada, con_capturas):
+        """Ranuras de la coincidencia elegida o None.
+
+        Anclada: la coincidencia debe cubrir toda la cadena. Si no, se busca la
+        coincidencia más a la izquierda y, desde ahí, la de mayor prioridad.
+        """
+        m = len(self.finales)
+        marcas = [-1] * m
+        generacion = 0
+        vacias = (None,) * (self.num_ranuras if con_capturas else 2)
+        finales = self.finales
+        simbolos = self.simbolos
+        n = len(cadena)
+        encontrada = None
+
+        # Con prefiltro, los hilos de inicio solo se crean donde aparece el prefijo obligatorio
+        prefiltro = None if anclada else self.prefiltro
+        candidato = prefiltro.siguiente_candidato(cadena, 0) if prefiltro else 0
+
+        actual = []
+        posicion = 0
+        while posicion <= n:
+            # Nuevo hilo de inicio con la menor prioridad, mientras no haya coincidencia
+            if encontrada is None and (posicion == 0 or not anclada):
+                if not actual and candidato > posicion:
+                    posicion = candidato  # salto directo al siguiente candidato
+                if posicion == candidato:
+                    inicial = (posicion,) + vacias[1:]
+                    self._agregar(actual, marcas, generacion, self.inicio, inicial, posicion, con_capturas)
+                    if prefiltro:
+                        candidato = prefiltro.siguiente_candidato(cadena, posicion + 1)
+                    else:
+                        candidato = posicion + 1
+            if not actual:
+                break
+
+            generacion += 1
+            siguiente = []
+            simbolo = cadena[posicion] if posicion < n else None
+            for estado, ranuras in actual:
+                if finales[estado] and (not anclada or posicion == n):
+                    encontrada = ranuras[:1] + (posicion,) + ranuras[2:]
+                    # Los hilos restantes tienen menor prioridad
+                    break
+                for destino in simbolos[estado].get(simbolo, ()):
+                    self._agregar(siguiente, marcas, generacion, destino, ranuras, posicion + 1, con_capturas)
+            actual = siguiente
+            posicion += 1
+
+        return encontrada
+
+    def coincidir(self, cadena, grupos=True):
+        """Coincidencia de toda la cadena: lista de spans (grupo 0 primero) o None"""
+        if self.prefiltro and self.prefiltro.descarta(cadena):
+            return None
+        if not grupos or self.num_grupos == 0:
+            # Camino rápido: conjuntos de estados sin ranuras
+            return [(0, len(cadena))] if self.acepta(cadena) else None
+        return self.spans(self.ejecutar(cadena, True, True))
+
+    def buscar(self, cadena, grupos=True):
+        """Primera coincidencia leftmost-first dentro de la cadena: lista de spans o None"""
+        if self.prefiltro and self.prefiltro.descarta_busqueda(cadena):
+            return None
+        con_capturas = grupos and self.num_grupos > 0
+        return self.spans(self.ejecutar(cadena, False, con_capturas))
+
+    def spans(self, ranuras):
+        if ranuras is None:
+            return None
+        return [(ranuras[i], ranuras[i + 1]) if ranuras[i] is not None and ranuras[i + 1] is not None else None
+                for i in range(0, len(ranuras), 2)]
+
+    def acepta(self, cadena):
+        """Pertenencia por conjuntos de estados, sin seguimiento de capturas"""
+        actual = self.clausura({self.inicio})
+        for simbolo in cadena:
+            siguiente = set()
+            for estado in actual:
+                siguiente.update(self.simbolos[estado].get(simbolo, ()))
+            if not siguiente:
+                return False
+            actual = self.clausura(siguiente)
+        return any(self.finales[estado] for estado in actual)
+
+    def clausura(self, estados):
+        resultado = set(estados)
+        pila = list(estados)
+        while pila:
+            for destino, _ in self.epsilon[pila.pop()]:
+                if destino not in resultado:
+                    resultado.add(destino)
+                    pila.append(destino)
+        return resultado
+
+
+def test_capturas():
+    """Spans de grupos y tiempo frente a re en una entrada adversaria para backtracking"""
+    import re
+    import time
+
+    casos = [
+        ("(a|b)*abb(a|b)*", "babbab"),
+        (r"if\((a|x|t)+\)\{y\}(else\{n\})?", "if(atx){y}else{n}"),
+        ("(a*)(a|b)(b*)", "aabbb"),
+        ("(0|1|2){1,3}(0*)", "2100"),
+    ]
+    print("=== CAPTURAS CON MÁQUINA DE PIKE ===")
+    for regex, cadena in casos:
+        maquina = MaquinaPike(compilar_con_capturas(regex))
+        spans = maquina.coincidir(cadena)
+        print(f"  {regex} sobre '{cadena}': {spans}")
+
+    print("\n  Búsqueda: (ab+)(c?) en 'xxabbbcab' ->",
+          MaquinaPike(compilar_con_capturas("(ab+)(c?)")).buscar("xxabbbcab"))
+
+    # (a|aa)*c sin 'c' final hace exponencial al backtracking; la máquina de Pike es lineal
+    maquina = MaquinaPike(compilar_con_capturas("(a|aa)*c"))
+    patron = re.compile("(a|aa)*c")
+    print("\n  (a|aa)*c sobre a^n (sin coincidencia):")
+    for n in (16, 20, 24, 1000, 100000):
+        cadena = 'a' * n
+        inicio = time.perf_counter()
+        maquina.coincidir(cadena)
+        tiempo_pike = time.perf_counter() - inicio
+        linea = f"    n={n:<7} Pike {tiempo_pike * 1000:.1f} ms"
+        if n <= 24:
+            inicio = time.perf_counter()
+            patron.fullmatch(cadena)
+            linea += f"  re {(time.perf_counter() - inicio) * 1000:.1f} ms"
+        print(linea)
+
+
+if __name__ == "__main__":
+    test_capturas()
@@ -0,0 +1,229 @@
+import io
+import time
+from contextlib import redirect_stdout
+from preprocesamiento import infix_to_postfix
+from thompson import Thompson
+
+
+class FragmentoPatron:
+    """AFN de Thompson de un patrón y su determinización perezosa, compartida entre versiones del conjunto"""
+
+    def __init__(self, regex):
+        self.regex = regex
+        with redirect_stdout(io.StringIO()):
+            self.afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+        if self.afn.transiciones_contador:
+            raise ValueError("AFN con contadores: construya sin modo_contador")
+        self.inicio = frozenset(self.afn.epsilon_closure({self.afn.start_state}))
+        self.pasos = {}   # (subconjunto, símbolo) -> subconjunto (vacío = sin transición)
+
+    def paso(self, subconjunto, simbolo):
+        clave = (subconjunto, simbolo)
+        destino = self.pasos.get(clave)
+        if destino is None:
+            destino = self.pasos[clave] = frozenset(self.afn.mover(subconjunto, simbolo))
+        return destino
+
+    def es_final(self, subconjunto):
+        return any(estado.is_final for estado in subconjunto)
+
+
+class ConjuntoPatrones:
+    """Unión de patrones que admite agregar y quitar patrones sin reconstruir todo.
+
+    Un estado del AFD de la unión es un frozenset de pares (id de patrón, subconjunto del AFN
+    de ese patrón) y se determiniza de forma perezosa al recorrer cadenas. Como los pares de
+    un patrón solo producen pares del mismo patrón:
+      - agregar un patrón solo cambia el estado inicial; todo estado ya compilado sigue válido.
+      - quitar un patrón invalida únicamente los estados que contienen pares suyos.
+    Los fragmentos por patrón (AFN y sus pasos) quedan en caché aunque el patrón se quite.
+    """
+    MAX_ESTADOS = 100000
+
+    def __init__(self, patrones=()):
+        self.fragmentos = {}   # regex -> FragmentoPatron
+        self.ids = {}          # regex activo -> id de patrón
+        self.por_id = {}       # id -> FragmentoPatron activo
+        self.siguiente_id = 0
+        self.siguiente_numero = 0
+        self.numeros = {}      # clave de estado -> número
+        self.claves = {}       # número -> clave de estado
+        self.filas = {}        # número -> {símbolo: número o -1}
+        self.finales = {}      # número -> ids de patrones que aceptan
+        self.por_patron = {}   # id -> números de estados con pares de ese patrón
+        self.inicio = None
+        self.invalidados = 0
+        for regex in patrones:
+            self.agregar(regex)
+
+    def agregar(self, regex):
+        if regex in self.ids:
+            return False
+        fragmento = self.fragmentos.get(regex)
+        if fragmento is None:
+            fragmento = self.fragmentos[regex] = FragmentoPatron(regex)
+        pid = self.siguiente_id
+        self.siguiente_id += 1
+        self.ids[regex] = pid
+        self.por_id[pid] = fragmento
+        self.inicio = None
+        return True
+
+    def quitar(self, regex):
+        pid = self.ids.pop(regex, None)
+        if pid is None:
+            return False
+        del self.por_id[pid]
+        for numero in self.por_patron.pop(pid, ()):
+            clave = self.claves.pop(numero, None)
+            if clave is None:
+                continue
+            del self.numeros[clave]
+            del self.filas[numero]
+            del self.finales[numero]
+            for otro, _ in clave:
+                if otro != pid and otro in self.por_patron:
+                    self.por_patron[otro].discard(numero)
+            self.invalidados += 1
+        # Las filas que apuntaban a estados invalidados también contienen el patrón: ya no existen
+        self.inicio = None
+        return True
+
+    def numero_estado(self, clave):
+        numero = self.numeros.get(clave)
+        if numero is None:
+            if len(self.claves) >= self.MAX_ESTADOS:
+                self.vaciar_estados()
+            numero = self.siguiente_numero
+            self.siguiente_numero += 1
+            self.numeros[clave] = numero
+            self.claves[numero] = clave
+            self.filas[numero] = {}
+            self.finales[numero] = frozenset(pid for pid, sub in clave if self.por_id[pid].es_final(sub))
+            for pid, _ in clave:
+                self.por_patron.setdefault(pid, set()).add(numero)
+        return numero
+
+    def vaciar_estados(self):
+        """Descarta el AFD de la unión (los fragmentos por patrón se conservan)"""
+        self.numeros.clear()
+        self.claves.clear()
+        self.filas.clear()
+        self.finales.clear()
+        self.por_patron.clear()
+        self.inicio = None
+
+    def estado_inicial(self):
+        if self.inicio is None or self.inicio not in self.claves:
+            clave = frozenset((pid, fragmento.inicio) for pid, fragmento in self.por_id.items())
+            self.inicio = self.numero_estado(clave)
+        return self.inicio
+
+    def transicion(self, numero, simbolo):
+        """Destino desde el estado numero, calculado y guardado la primera vez (-1 = muerto)"""
+        fila = self.filas[numero]
+        destino = fila.get(simbolo)
+        if destino is None:
+            pares = []
+            for pid, sub in self.claves[numero]:
+                siguiente = self.por_id[pid].paso(sub, simbolo)
+                if siguiente:
+                    pares.append((pid, siguiente))
+            destino = self.numero_estado(frozenset(pares)) if pares else -1
+            # numero_estado pudo vaciar el AFD: la fila solo se guarda si el origen sigue vivo
+            fila = self.filas.get(numero)
+            if fila is not None:
+                fila[simbolo] = destino
+        return destino
+
+    def estado_final(self, cadena):
+        estado = self.estado_inicial()
+        filas = self.filas
+        for c in cadena:
+            destino = filas[estado].get(c)
+            if destino is None:
+                destino = self.transicion(estado, c)
+            if destino < 0:
+                return -1
+            estado = destino
+        return estado
+
+    def coincidencias(self, cadena):
+        """Patrones activos que aceptan la cadena completa"""
+        estado = self.estado_final(cadena)
+        if estado < 0:
+            return set()
+        return {self.por_id[pid].regex for pid in self.finales[estado]}
+
+    def coincide(self, cadena):
+        estado = self.estado_final(cadena)
+        return estado >= 0 and bool(self.finales[estado])
+
+    def __len__(self):
+        return len(self.ids)
+
+
+def reconstruir_union(patrones):
+    """Camino completo: regex de la unión → Thompson → Subconjuntos → minimización"""
+    from subconjuntos import Subconjuntos
+    from minimizacion import MinimizacionAFD
+
+    regex = '|'.join(f"({p})" for p in patrones)
+    with redirect_stdout(io.StringIO()):
+        afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+        return MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+
+
+def benchmark_conjunto_patrones(tamanos=(10, 20, 40, 80), consultas=2000, semilla=0):
+    """Latencia de agregar/quitar un patrón frente a reconstruir la unión completa"""
+    import random
+
+    generador = random.Random(semilla)
+    plantillas = ["usr{i}(0|1|2|3)+", "adm{i}(a|b)*z", "grp{i}x?y", "svc{i}(ab|ba)+", "tmp{i}(0|1)*(a|b)"]
+    patrones = [plantillas[i % len(plantillas)].format(i=i) for i in range(max(tamanos) + 1)]
+
+    def muestra(i):
+        prefijo = patrones[i][:patrones[i].index('(')] if '(' in patrones[i] else patrones[i][:-3]
+        return prefijo + ''.join(generador.choice("0123abxyz") for _ in range(generador.randint(0, 4)))
+
+    print("=== CONJUNTO INCREMENTAL DE PATRONES ===")
+    print(f"{'patrones':>9} {'agregar':>10} {'quitar':>10} {'reconstruir':>12} {'estados válidos':>16}")
+    conjunto = ConjuntoPatrones()
+    for tamano in tamanos:
+        while len(conjunto) < tamano:
+            conjunto.agregar(patrones[len(conjunto)])
+        entradas = [muestra(generador.randrange(tamano)) for _ in range(consultas)]
+        for e in entradas:
+            conjunto.coincide(e)
+
+        nuevo = patrones[tamano]
+        inicio = time.perf_counter()
+        conjunto.agregar(nuevo)
+        incremental = [conjunto.coincide(e) for e in entradas]
+        tiempo_agregar = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        conjunto.quitar(nuevo)
+        [conjunto.coincide(e) for e in entradas]
+        tiempo_quitar = time.perf_counter() - inicio
+        validos = len(conjunto.claves)
+
+        inicio = time.perf_counter()
+        afd = reconstruir_union(patrones[:tamano + 1])
+        completo = []
+        for e in entradas:
+            estado = afd.start_state
+            for c in e:
+                estado = afd.transitions.get((estado, c))
+                if estado is None:
+                    break
+            completo.append(estado in afd.final_states)
+        tiempo_reconstruir = time.perf_counter() - inicio
+
+        print(f"{tamano:>9} {tiempo_agregar * 1000:>8.1f}ms {tiempo_quitar * 1000:>8.1f}ms "
+              f"{tiempo_reconstruir * 1000:>10.1f}ms {validos:>16}  "
+              f"mismos resultados: {incremental == completo}")
+
+
+if __name__ == "__main__":
+    benchmark_conjunto_patrones()
@@ -0,0 +1,170 @@
+import random
+from bisect import bisect_right
+
+
+def _numpy():
+    """NumPy si está instalado; se importa solo al usarlo para no cargarlo con el módulo"""
+    try:
+        import numpy
+    except ImportError:  # NumPy es opcional: sin él, la potencia de matrices se hace en Python puro
+        return None
+    return numpy
+
+
+class ConteoAFD:
+    """Conteo de cadenas aceptadas y muestreo uniforme sobre un AFD (idealmente mínimo).
+
+    conteos[k][s] = cantidad de cadenas de longitud k aceptadas desde el estado s.
+    Los conteos son enteros de Python, así que no hay desbordamiento.
+    """
+
+    def __init__(self, afd):
+        self.afd = afd
+        estados = sorted(afd.states, key=lambda e: (e != afd.start_state, str(e)))
+        self.numeros = {estado: i for i, estado in enumerate(estados)}
+        self.inicio = self.numeros.get(afd.start_state)
+        self.finales = [estado in afd.final_states for estado in estados]
+
+        # salidas[s]: [(símbolo, destino)] en orden de símbolo
+        self.salidas = [[] for _ in estados]
+        for (origen, simbolo), destino in sorted(afd.transitions.items(), key=lambda t: t[0][1]):
+            self.salidas[self.numeros[origen]].append((simbolo, self.numeros[destino]))
+
+        self.conteos = [[1 if final else 0 for final in self.finales]]
+        self.acumulados = {}
+
+    def extender(self, n):
+        """Completa conteos hasta la longitud n: O(n · transiciones)"""
+        salidas = self.salidas
+        while len(self.conteos) <= n:
+            anterior = self.conteos[-1]
+            self.conteos.append([sum(anterior[d] for _, d in salidas[s]) for s in range(len(salidas))])
+        return self.conteos
+
+    def contar(self, n):
+        """Cadenas de longitud exactamente n aceptadas"""
+        if self.inicio is None:
+            return 0
+        return self.extender(n)[n][self.inicio]
+
+    def contar_potencia(self, n):
+        """Mismo conteo por potencia de la matriz de adyacencia: O(m³ log n) multiplicaciones"""
+        if self.inicio is None:
+            return 0
+        m = len(self.salidas)
+        matriz = [[0] * m for _ in range(m)]
+        for s, salidas in enumerate(self.salidas):
+            for _, d in salidas:
+                matriz[s][d] += 1
+
+        np = _numpy()
+        if np is not None:
+            # dtype=object conserva enteros de precisión arbitraria
+            potencia = np.linalg.matrix_power(np.array(matriz, dtype=object), n)
+            fila = potencia[self.inicio]
+            return int(sum(fila[t] for t in range(m) if self.finales[t]))
+
+        vector = [1 if final else 0 for final in self.finales]
+        # M^n · f por cuadrados sucesivos aplicados al vector
+        while n:
+            if n & 1:
+                vector = [sum(fila[t] * vector[t] for t in range(m) if fila[t]) for fila in matriz]
+            n >>= 1
+            if n:
+                matriz = [[sum(fila[k] * matriz[k][j] for k in range(m) if fila[k]) for j in range(m)]
+                          for fila in matriz]
+        return vector[self.inicio]
+
+    def tabla_acumulada(self, k, s):
+        """(acumulados, símbolos, destinos) para elegir la transición desde s con k símbolos restantes"""
+        if k < 1:
+            raise ValueError(f"Sin símbolos restantes no hay transición que elegir (k={k})")
+        clave = (k, s)
+        tabla = self.acumulados.get(clave)
+        if tabla is None:
+            restantes = self.conteos[k - 1]
+            acumulados, simbolos, destinos = [], [], []
+            total = 0
+            for simbolo, d in self.salidas[s]:
+                if restantes[d]:
+                    total += restantes[d]
+                    acumulados.append(total)
+                    simbolos.append(simbolo)
+                    destinos.append(d)
+            tabla = self.acumulados[clave] = (acumulados, simbolos, destinos)
+        return tabla
+
+    def muestrear(self, n, generador=random):
+        """Cadena aceptada de longitud n elegida uniformemente, o None si no hay ninguna"""
+        if self.contar(n) == 0:
+            return None
+        estado = self.inicio
+        simbolos = []
+        for k in range(n, 0, -1):
+            acumulados, opciones, destinos = self.tabla_acumulada(k, estado)
+            i = bisect_right(acumulados, generador.randrange(acumulados[-1]))
+            simbolos.append(opciones[i])
+            estado = destinos[i]
+        return ''.join(simbolos)
+
+    def generar(self, n, cantidad, semilla=None):
+        """Genera cantidad cadenas uniformes de longitud n (perezoso, para corpus grandes)"""
+        if self.contar(n) == 0:
+            return
+        generador = random.Random(semilla)
+        randrange = generador.randrange
+        # tablas[0] es solo relleno para indexar por k: con 0 símbolos restantes no se elige nada
+        tablas = [None] + [[self.tabla_acumulada(k, s) if self.conteos[k][s] else None
+                            for s in range(len(self.salidas))] for k in range(1, n + 1)]
+        for _ in range(cantidad):
+            estado = self.inicio
+            simbolos = []
+            for k in range(n, 0, -1):
+                acumulados, opciones, destinos = tablas[k][estado]
+                # randrange es exacto (sin el sesgo de escalar random()) también con totales enormes
+                i = bisect_right(acumulados, randrange(acumulados[-1]))
+                simbolos.append(opciones[i])
+                estado = destinos[i]
+            yield ''.join(simbolos)
+
+
+def benchmark_conteo(longitudes=(10, 1000, 5000), cantidad=1000000):
+    """Conteo por DP y por potencia de matrices, y velocidad de generación uniforme"""
+    import io
+    import time
+    from collections import Counter
+    from contextlib import redirect_stdout
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+    from minimizacion import MinimizacionAFD
+
+    with redirect_stdout(io.StringIO()):
+        afn = Thompson().construir_desde_postfix(infix_to_postfix("(a|b)*abb(a|b)*"))
+        afd = MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+    conteo = ConteoAFD(afd)
+
+    print("=== CONTEO Y MUESTREO UNIFORME: (a|b)*abb(a|b)* ===")
+    print(f"Potencia de matrices con {'NumPy' if _numpy() is not None else 'Python puro'}")
+    for n in longitudes:
+        inicio = time.perf_counter()
+        por_dp = ConteoAFD(afd).contar(n)
+        tiempo_dp = time.perf_counter() - inicio
+        inicio = time.perf_counter()
+        por_potencia = conteo.contar_potencia(n)
+        tiempo_potencia = time.perf_counter() - inicio
+        print(f"  n={n:<6} {len(str(por_dp))} dígitos  DP {tiempo_dp * 1000:.1f} ms  "
+              f"potencia {tiempo_potencia * 1000:.1f} ms  iguales: {por_dp == por_potencia}")
+
+    frecuencias = Counter(conteo.generar(6, 100000, semilla=1))
+    print(f"\n  Longitud 6: {conteo.contar(6)} cadenas aceptadas, {len(frecuencias)} generadas, "
+          f"frecuencia mín/máx {min(frecuencias.values())}/{max(frecuencias.values())}")
+
+    inicio = time.perf_counter()
+    total = sum(1 for _ in conteo.generar(12, cantidad, semilla=2))
+    tiempo = time.perf_counter() - inicio
+    print(f"  {total} cadenas de longitud 12 en {tiempo:.2f} s ({total / tiempo:.0f}/s)")
+
+
+if __name__ == "__main__":
+    benchmark_conteo()
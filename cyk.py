@@ -0,0 +1,238 @@
+from collections import defaultdict
+from eliminador_epsilon import producciones_utiles
+from gramatica_compacta import tokens_de
+
+
+class ConversorFNC:
+    """Forma normal de Chomsky a partir de una gramática sin producciones-ε.
+
+    Acepta Gramatica o GramaticaCompacta (la salida de EliminadorEpsilon). Internamente
+    los no terminales son enteros 0..n-1 y los terminales conservan su símbolo original.
+    """
+
+    def __init__(self, gramatica):
+        self.gramatica = gramatica
+        self.no_terminales = []   # id -> nombre (None para los auxiliares)
+        self.ids = {}             # nombre -> id
+        self.acepta_vacia = False
+        self.inicial = None
+        self.reglas_terminales = defaultdict(set)   # A -> {a}
+        self.reglas_binarias = set()                # (A, B, C)
+
+    def id_no_terminal(self, nombre):
+        if nombre not in self.ids:
+            self.ids[nombre] = len(self.no_terminales)
+            self.no_terminales.append(nombre)
+        return self.ids[nombre]
+
+    def nuevo_auxiliar(self):
+        self.no_terminales.append(None)
+        return len(self.no_terminales) - 1
+
+    def convertir(self):
+        g = self.gramatica
+        self.inicial = self.id_no_terminal(g.simbolo_inicial)
+
+        # Cuerpos como tuplas: ('N', id) para no terminales, ('T', símbolo) para terminales
+        producciones = defaultdict(set)
+        for nt, cuerpos in producciones_utiles(g).items():
+            cabeza = self.id_no_terminal(nt)
+            for cuerpo in cuerpos:
+                if cuerpo == g.EPSILON:
+                    if nt != g.simbolo_inicial:
+                        raise ValueError(f"Producción-ε en {g.nombre(nt)}: aplique EliminadorEpsilon primero")
+                    self.acepta_vacia = True
+                    continue
+                producciones[cabeza].add(tuple(
+                    ('T', s) if g.es_terminal(s) else ('N', self.id_no_terminal(s)) for s in cuerpo))
+
+        producciones = self.eliminar_unitarias(producciones)
+        producciones = self.eliminar_inutiles(producciones)
+        self.binarizar(producciones)
+
+        print(f"FNC: {len(self.no_terminales)} no terminales, {len(self.reglas_binarias)} reglas binarias, "
+              f"{sum(len(t) for t in self.reglas_terminales.values())} reglas terminales")
+        return self
+
+    def eliminar_unitarias(self, producciones):
+        """A → B se reemplaza por A → α para cada B → α no unitaria alcanzable por unitarias"""
+        resultado = defaultdict(set)
+        for a in list(producciones):
+            alcanzados = {a}
+            stack = [a]
+            while stack:
+                actual = stack.pop()
+                for cuerpo in producciones.get(actual, ()):
+                    if len(cuerpo) == 1 and cuerpo[0][0] == 'N':
+                        destino = cuerpo[0][1]
+                        if destino not in alcanzados:
+                            alcanzados.add(destino)
+                            stack.append(destino)
+                    else:
+                        resultado[a].add(cuerpo)
+        return resultado
+
+    def eliminar_inutiles(self, producciones):
+        """Conserva los no terminales generadores y alcanzables desde el inicial"""
+        # Generadores por lista de trabajo con contador por producción
+        generadores = set()
+        restantes = []
+        apariciones = defaultdict(list)
+        pendientes = []
+        for a, cuerpos in producciones.items():
+            for cuerpo in cuerpos:
+                no_terminales = [s[1] for s in cuerpo if s[0] == 'N']
+                indice = len(restantes)
+                restantes.append((a, len(no_terminales)))
+                for b in no_terminales:
+                    apariciones[b].append(indice)
+                if not no_terminales and a not in generadores:
+                    generadores.add(a)
+                    pendientes.append(a)
+
+        while pendientes:
+            b = pendientes.pop()
+            for indice in apariciones[b]:
+                a, faltan = restantes[indice]
+                restantes[indice] = (a, faltan - 1)
+                if faltan - 1 == 0 and a not in generadores:
+                    generadores.add(a)
+                    pendientes.append(a)
+
+        filtradas = {a: {c for c in cuerpos if all(s[0] == 'T' or s[1] in generadores for s in c)}
+                     for a, cuerpos in producciones.items() if a in generadores}
+
+        alcanzables = {self.inicial}
+        stack = [self.inicial]
+        while stack:
+            a = stack.pop()
+            for cuerpo in filtradas.get(a, ()):
+                for tipo, s in cuerpo:
+                    if tipo == 'N' and s not in alcanzables:
+                        alcanzables.add(s)
+                        stack.append(s)
+
+        return {a: cuerpos for a, cuerpos in filtradas.items() if a in alcanzables}
+
+    def binarizar(self, producciones):
+        """Terminales en cuerpos largos pasan a T_a → a; cuerpos de n > 2 símbolos a cadenas binarias"""
+        por_terminal = {}
+
+        def como_no_terminal(simbolo):
+            tipo, valor = simbolo
+            if tipo == 'N':
+                return valor
+            if valor not in por_terminal:
+                por_terminal[valor] = self.nuevo_auxiliar()
+                self.reglas_terminales[por_terminal[valor]].add(valor)
+            return por_terminal[valor]
+
+        for a, cuerpos in producciones.items():
+            for cuerpo in cuerpos:
+                if len(cuerpo) == 1:
+                    self.reglas_terminales[a].add(cuerpo[0][1])
+                    continue
+
+                ids = [como_no_terminal(s) for s in cuerpo]
+                cabeza = a
+                for simbolo in ids[:-2]:
+                    auxiliar = self.nuevo_auxiliar()
+                    self.reglas_binarias.add((cabeza, simbolo, auxiliar))
+                    cabeza = auxiliar
+                self.reglas_binarias.add((cabeza, ids[-2], ids[-1]))
+
+
+class ParserCYK:
+    """CYK con celdas como bitsets (int) de no terminales y tablas (B, C) → A precalculadas"""
+
+    def __init__(self, gramatica):
+        self.fnc = ConversorFNC(gramatica).convertir()
+        self.gramatica = gramatica
+
+        # Terminal -> máscara de los A con A → a
+        self.por_terminal = defaultdict(int)
+        for a, terminales in self.fnc.reglas_terminales.items():
+            for terminal in terminales:
+                self.por_terminal[terminal] |= 1 << a
+
+        # B -> [(C, máscara de los A con A → B C)] y máscara de todos esos C para descartar rápido
+        tabla = defaultdict(lambda: defaultdict(int))
+        for a, b, c in self.fnc.reglas_binarias:
+            tabla[b][c] |= 1 << a
+        self.derechas = {b: list(por_c.items()) for b, por_c in tabla.items()}
+        self.mascara_derecha = {b: sum(1 << c for c in por_c) for b, por_c in tabla.items()}
+
+    def combinar(self, izquierda, derecha):
+        resultado = 0
+        while izquierda:
+            bajo = izquierda & -izquierda
+            b = bajo.bit_length() - 1
+            izquierda ^= bajo
+            if derecha & self.mascara_derecha.get(b, 0):
+                for c, mascara_a in self.derechas[b]:
+                    if derecha >> c & 1:
+                        resultado |= mascara_a
+        return resultado
+
+    def pertenece(self, entrada):
+        tokens = tokens_de(self.gramatica, entrada)
+        n = len(tokens)
+        if n == 0:
+            return self.fnc.acepta_vacia
+
+        # filas[i]: {j: bitset} solo con las celdas no vacías que empiezan en i
+        filas = [None] * n
+        for i in range(n - 1, -1, -1):
+            fila = {}
+            unitaria = self.por_terminal.get(tokens[i], 0)
+            if unitaria:
+                fila[i] = unitaria
+            # Extremos k ordenados de celdas no vacías (i, k) ya calculadas en esta fila
+            extremos = [i] if unitaria else []
+
+            for j in range(i + 1, n):
+                celda = 0
+                for k in extremos:
+                    derecha = filas[k + 1].get(j)
+                    if derecha:
+                        celda |= self.combinar(fila[k], derecha)
+                if celda:
+                    fila[j] = celda
+                    extremos.append(j)
+            filas[i] = fila
+
+        return bool(filas[0].get(n - 1, 0) >> self.fnc.inicial & 1)
+
+
+def benchmark_cyk(longitudes=(500, 1000, 2000, 4000)):
+    """Mide CYK en una gramática anidada (celdas dispersas) y en una de expresiones"""
+    import io
+    import time
+    from contextlib import redirect_stdout
+    from eliminador_epsilon import crear_gramatica, EliminadorEpsilon
+
+    def preparar(producciones):
+        with redirect_stdout(io.StringIO()):
+            sin_epsilon = EliminadorEpsilon(crear_gramatica(producciones)).eliminar_producciones_epsilon()
+            return ParserCYK(sin_epsilon)
+
+    anidada = preparar([('S', 'aSb'), ('S', 'c'), ('S', 'ε')])
+    expresiones = preparar([('E', 'E+T'), ('E', 'T'), ('T', 'T*F'), ('T', 'F'), ('F', '(E)'), ('F', 'x')])
+
+    print("=== BENCHMARK CYK ===")
+    for n in longitudes:
+        mitad = (n - 1) // 2
+        entrada = 'a' * mitad + 'c' + 'b' * mitad
+        inicio = time.perf_counter()
+        acepta = anidada.pertenece(entrada)
+        print(f"  a^k c b^k   n={len(entrada):<6} {acepta}  {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+    for n in longitudes[:2]:
+        entrada = '+'.join('(x*x)' for _ in range(n // 6)) or 'x'
+        inicio = time.perf_counter()
+        acepta = expresiones.pertenece(entrada)
+        print(f"  expresión   n={len(entrada):<6} {acepta}  {(time.perf_counter() - inicio) * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_cyk()
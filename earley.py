@@ -0,0 +1,224 @@
+import sys
+from eliminador_epsilon import calcular_anulables, producciones_utiles
+from gramatica_compacta import tokens_de
+
+
+class ReconocedorEarley:
+    """Reconocedor de Earley incremental sobre Gramatica o GramaticaCompacta.
+
+    Los ítems se codifican como enteros origen * num_puntos + punto, donde punto
+    identifica la regla con el punto en una posición. Los anulables se toman de
+    EliminadorEpsilon.encontrar_anulables y se aplican en la predicción
+    (corrección de Aycock–Horspool), así que no hace falta completar con ε.
+
+    La recursión por la derecha usa los ítems transitivos de Leo: si en el conjunto j
+    un único ítem espera a A y A es su último símbolo, completar A desde j salta
+    directamente al ítem completo más alto de esa cadena determinista, en lugar de
+    agregar un ítem por nivel. Así S → aS | a queda con conjuntos de tamaño constante.
+    """
+
+    def __init__(self, gramatica):
+        self.gramatica = gramatica
+        g = gramatica
+
+        self.anulables = calcular_anulables(g)
+
+        # Tablas por punto: símbolo siguiente (None si la regla está completa) y cabeza
+        self.siguiente = []
+        self.cabeza = []
+        self.puntos_iniciales = {}   # no terminal -> puntos con el punto al inicio
+        # Sin cuerpos que usan no terminales sin producciones: toda otra cosa tras el punto es terminal
+        for nt, cuerpos in producciones_utiles(g).items():
+            for cuerpo in cuerpos:
+                simbolos = () if cuerpo == g.EPSILON else tuple(cuerpo)
+                self.puntos_iniciales.setdefault(nt, []).append(len(self.siguiente))
+                for posicion in range(len(simbolos) + 1):
+                    self.siguiente.append(simbolos[posicion] if posicion < len(simbolos) else None)
+                    self.cabeza.append(nt)
+        self.num_puntos = len(self.siguiente)
+
+        self.reiniciar()
+
+    def reiniciar(self):
+        self.posicion = 0
+        # esperando[i]: símbolo -> ítems del conjunto i con ese símbolo tras el punto
+        self.esperando = []
+        # leo[j]: no terminal -> ítem completo más alto de su cadena determinista (o None)
+        self.leo = []
+        self.completos_iniciales = False
+        self.tamanos = []
+        self._cerrar([o for o in self.puntos_iniciales.get(self.gramatica.simbolo_inicial, [])])
+
+    def _leo(self, j, nt):
+        """Ítem transitivo de Leo para completar nt desde el conjunto j, o None.
+
+        La cadena solo sigue hacia orígenes estrictamente menores, lo que evita ciclos
+        de reglas unitarias y garantiza que un ítem inicial con origen 0 sea el más alto.
+        """
+        n = self.num_puntos
+        camino = []
+        superior = None
+        while True:
+            memo = self.leo[j]
+            if nt in memo:
+                superior = memo[nt]
+                break
+            lista = self.esperando[j].get(nt)
+            if lista is None or len(lista) != 1:
+                memo[nt] = None
+                break
+            item = lista[0]
+            origen, punto = divmod(item, n)
+            if self.siguiente[punto + 1] is not None:
+                memo[nt] = None
+                break
+            camino.append((j, nt, item + 1))
+            if origen >= j:
+                break
+            j, nt = origen, self.cabeza[punto]
+
+        # Se completan los memos del camino de arriba hacia abajo
+        for j, nt, completo in reversed(camino):
+            if superior is None:
+                superior = completo
+            self.leo[j][nt] = superior
+        return superior
+
+    def _cerrar(self, semillas):
+        """Predicción y compleción sobre el conjunto de la posición actual"""
+        i = self.posicion
+        n = self.num_puntos
+        siguiente = self.siguiente
+        cabeza = self.cabeza
+        puntos_iniciales = self.puntos_iniciales
+        anulables = self.anulables
+
+        conjunto = set(semillas)
+        pendientes = list(conjunto)
+        esperando = {}
+        self.esperando.append(esperando)
+        self.leo.append({})
+        completos_iniciales = False
+
+        def agregar(item):
+            if item not in conjunto:
+                conjunto.add(item)
+                pendientes.append(item)
+
+        while pendientes:
+            item = pendientes.pop()
+            origen, punto = divmod(item, n)
+            simbolo = siguiente[punto]
+
+            if simbolo is None:
+                nt = cabeza[punto]
+                if origen == 0 and nt == self.gramatica.simbolo_inicial:
+                    completos_iniciales = True
+                # Con origen == i, la predicción ya avanzó sobre el anulable
+                if origen != i:
+                    superior = self._leo(origen, nt)
+                    if superior is not None:
+                        agregar(superior)
+                    else:
+                        for esperando_item in self.esperando[origen].get(nt, ()):
+                            agregar(esperando_item + 1)
+            elif simbolo in puntos_iniciales:
+                lista = esperando.get(simbolo)
+                if lista is None:
+                    esperando[simbolo] = lista = []
+                    for inicial in puntos_iniciales[simbolo]:
+                        agregar(i * n + inicial)
+                lista.append(item)
+                if simbolo in anulables:
+                    agregar(item + 1)
+            else:
+                esperando.setdefault(simbolo, []).append(item)
+
+        self.completos_iniciales = completos_iniciales
+        self.tamanos.append(len(conjunto))
+        return conjunto
+
+    def alimentar(self, token):
+        """Consume un token; devuelve False si ninguna derivación puede continuar"""
+        if self.esperando[self.posicion] is None:
+            return False
+
+        avanzados = [item + 1 for item in self.esperando[self.posicion].get(token, ())]
+        self.posicion += 1
+        if not avanzados:
+            self.esperando.append(None)
+            self.leo.append(None)
+            self.completos_iniciales = False
+            self.tamanos.append(0)
+            return False
+
+        self._cerrar(avanzados)
+        return True
+
+    def acepta(self):
+        return self.completos_iniciales
+
+    def reconocer(self, entrada):
+        self.reiniciar()
+        for token in tokens_de(self.gramatica, entrada):
+            if not self.alimentar(token):
+                return False
+        return self.acepta()
+
+    def memoria_por_posicion(self):
+        """(ítems, bytes aproximados del índice guardado) por posición"""
+        resultado = []
+        for tamano, esperando in zip(self.tamanos, self.esperando):
+            memoria = 0
+            if esperando is not None:
+                memoria = sys.getsizeof(esperando) + sum(sys.getsizeof(lista) for lista in esperando.values())
+            resultado.append((tamano, memoria))
+        return resultado
+
+
+def benchmark_earley(longitudes=(1000, 10000, 50000)):
+    """Tiempo y memoria por posición en gramáticas tipo LR, con anulables y recursivas por la derecha"""
+    import time
+    from eliminador_epsilon import crear_gramatica
+
+    def crear(producciones):
+        return ReconocedorEarley(crear_gramatica(producciones))
+
+    expresiones = crear([('E', 'E+T'), ('E', 'T'), ('T', 'T*F'), ('T', 'F'), ('F', '(E)'), ('F', 'x')])
+    listas = crear([('L', 'LIO'), ('L', 'ε'), ('I', 'x'), ('O', ';'), ('O', 'ε')])
+    derecha = crear([('S', 'aS'), ('S', 'a')])
+
+    print("=== BENCHMARK EARLEY ===")
+    for n in longitudes:
+        for nombre, reconocedor, entrada in (("expresión", expresiones, ('(x*x)+' * (n // 6)) + 'x'),
+                                             ("lista", listas, 'x;x' * (n // 3))):
+            inicio = time.perf_counter()
+            acepta = reconocedor.reconocer(entrada)
+            tiempo = time.perf_counter() - inicio
+            memoria = reconocedor.memoria_por_posicion()
+            items = max(t for t, _ in memoria)
+            bytes_promedio = sum(b for _, b in memoria) / len(memoria)
+            print(f"  {nombre:<10} n={len(entrada):<6} {acepta}  {tiempo * 1000:.0f} ms  "
+                  f"máx. ítems/posición={items}  ~{bytes_promedio:.0f} B/posición")
+
+    # Con los ítems de Leo, S → aS | a no acumula un ítem por nivel de recursión
+    print("\n  S → aS | a:")
+    medidas = []
+    for n in longitudes:
+        inicio = time.perf_counter()
+        acepta = derecha.reconocer('a' * n)
+        tiempo = time.perf_counter() - inicio
+        items = max(derecha.tamanos)
+        medidas.append((n, tiempo, items))
+        print(f"  derecha    n={n:<6} {acepta}  {tiempo * 1000:.0f} ms  máx. ítems/posición={items}")
+
+    (n0, t0, items0), (n1, t1, items1) = medidas[0], medidas[-1]
+    # Margen amplio para el ruido de temporización; un crecimiento cuadrático lo excede por mucho
+    lineal = items1 == items0 and t1 / max(t0, 1e-6) < 4 * n1 / n0
+    print(f"  Crecimiento {'lineal ✅' if lineal else 'superlineal ❌'}: ×{n1 // n0} en n, "
+          f"×{t1 / max(t0, 1e-6):.1f} en tiempo")
+    assert lineal, "Earley dejó de ser lineal en la recursión por la derecha"
+
+
+if __name__ == "__main__":
+    benchmark_earley()
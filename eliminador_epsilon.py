@@ -1,7 +1,10 @@
-from itertools import combinations
+# Cambiar al modificar el resultado de EliminadorEpsilon (invalida resultados en caché)
+VERSION_ALGORITMO = 1
 
 
 class Gramatica:
+    EPSILON = 'ε'
+
     def __init__(self):
         self.producciones = {}  # {no_terminal: [lista_de_cuerpos]}
         self.no_terminales = set()
@@ -28,12 +31,59 @@ class Gramatica:
             cuerpos = " | ".join(self.producciones[nt])
             print(f"{nt} → {cuerpos}")
 
+    # Interfaz compartida con GramaticaCompacta, usada por EliminadorEpsilon
+
+    def nueva(self):
+        """Gramática vacía que conserva qué símbolos son no terminales"""
+        nueva = Gramatica()
+        nueva.no_terminales = set(self.no_terminales)
+        return nueva
+
+    def es_terminal(self, simbolo):
+        # Las mayúsculas son no terminales aunque ya no tengan producciones (p. ej. tras quitar ε)
+        return simbolo not in self.no_terminales and not 'A' <= simbolo <= 'Z'
+
+    def crear_cuerpo(self, simbolos):
+        return ''.join(simbolos) or 'ε'
+
+    def crear_auxiliar(self, en_uso):
+        """No terminal auxiliar de un carácter: primero mayúsculas libres, luego uso privado Unicode"""
+        candidatos = (chr(c) for c in list(range(ord('A'), ord('Z') + 1)) + list(range(0xE000, 0xF900)))
+        for candidato in candidatos:
+            if candidato not in en_uso:
+                en_uso.add(candidato)
+                return candidato
+        raise ValueError("No quedan símbolos disponibles para no terminales auxiliares")
+
+    def nombre(self, simbolo):
+        return simbolo
+
+    def texto(self, cuerpo):
+        return cuerpo
+
+
+def combinaciones_cuerpo(gramatica, cuerpo, posiciones_anulables):
+    """Genera perezosamente, sin repetir, los cuerpos que resultan de omitir anulables"""
+    vistos = set()
+    for mascara in range(1 << len(posiciones_anulables)):
+        omitidas = {posiciones_anulables[b] for b in range(len(posiciones_anulables)) if mascara >> b & 1}
+        nuevo_cuerpo = gramatica.crear_cuerpo(simbolo for k, simbolo in enumerate(cuerpo) if k not in omitidas)
+        if nuevo_cuerpo not in vistos:
+            vistos.add(nuevo_cuerpo)
+            yield nuevo_cuerpo, omitidas
+
 
 class EliminadorEpsilon:
-    def __init__(self, gramatica):
+    # Combinaciones a partir de las cuales se resume la salida por consola
+    MAX_COMBINACIONES_DETALLE = 16
+
+    def __init__(self, gramatica, umbral_anulables=None):
         self.gramatica_original = gramatica
+        # Con umbral, los cuerpos con más anulables se binarizan con no terminales auxiliares
+        self.umbral_anulables = umbral_anulables
+        self.auxiliares = []
         self.anulables = set()
-        self.nueva_gramatica = Gramatica()
+        self.nueva_gramatica = gramatica.nueva()
         self.nueva_gramatica.simbolo_inicial = gramatica.simbolo_inicial
         # Guardar qué símbolos producen epsilon DIRECTAMENTE
         self.epsilon_directos = set()
@@ -48,7 +98,7 @@ class EliminadorEpsilon:
         # Mostrar estadísticas iniciales
         total_prod = sum(len(cuerpos) for cuerpos in self.gramatica_original.producciones.values())
         prod_epsilon = sum(1 for cuerpos in self.gramatica_original.producciones.values()
-                           for cuerpo in cuerpos if cuerpo == 'ε')
+                           for cuerpo in cuerpos if cuerpo == self.gramatica_original.EPSILON)
 
         print(f"\nEstadísticas iniciales:")
         print(f"  Total de producciones: {total_prod}")
@@ -62,51 +112,53 @@ class EliminadorEpsilon:
 
     def encontrar_anulables(self):
         print(f"\n--- PASO 1: Encontrar símbolos anulables ---")
+        g = self.gramatica_original
 
         # Paso 1: Encontrar símbolos que producen ε directamente
-        for nt, cuerpos in self.gramatica_original.producciones.items():
-            if 'ε' in cuerpos:
+        for nt, cuerpos in g.producciones.items():
+            if g.EPSILON in cuerpos:
                 self.anulables.add(nt)
                 self.epsilon_directos.add(nt)
-                print(f"  {nt} → ε (anulable directo)")
-
-        print(f"Anulables directos: {sorted(self.anulables)}")
+                print(f"  {g.nombre(nt)} → ε (anulable directo)")
 
-        cambio = True
-        iteracion = 1
+        print(f"Anulables directos: {self.nombres_ordenados(self.anulables)}")
 
-        while cambio:
-            cambio = False
-            anulables_antes = len(self.anulables)
-            nuevos_anulables = set()
-
-            print(f"\nIteración {iteracion}:")
-
-            for nt, cuerpos in self.gramatica_original.producciones.items():
-                if nt not in self.anulables:
-                    for cuerpo in cuerpos:
-                        if cuerpo != 'ε' and self.es_cadena_anulable(cuerpo):
-                            nuevos_anulables.add(nt)
-                            print(f"  {nt} es anulable (produce '{cuerpo}' que es anulable)")
-                            break
-            if nuevos_anulables:
-                self.anulables.update(nuevos_anulables)
-                cambio = True
-                print(f"  Nuevos anulables en iteración {iteracion}: {sorted(nuevos_anulables)}")
-            else:
-                print(f"  No hay nuevos símbolos anulables")
-
-            iteracion += 1
-
-            if iteracion > 10:
-                print("   Deteniendo después de 10 iteraciones")
-                break
-
-        print(f"\nSímbolos anulables finales: {sorted(self.anulables)}")
-        print(f"Símbolos con ε directo: {sorted(self.epsilon_directos)}")
+        # Índice inverso: símbolo -> producciones donde aparece (una entrada por ocurrencia)
+        # y contador por producción de símbolos aún no anulables
+        cabezas = []
+        restantes = []
+        apariciones = {}
+        for nt, cuerpos in g.producciones.items():
+            for cuerpo in cuerpos:
+                if cuerpo == g.EPSILON:
+                    continue
+                indice = len(cabezas)
+                cabezas.append((nt, cuerpo))
+                restantes.append(len(cuerpo))
+                for simbolo in cuerpo:
+                    apariciones.setdefault(simbolo, []).append(indice)
+
+        # Cada símbolo entra una sola vez a la lista de trabajo: tiempo lineal
+        pendientes = list(self.anulables)
+        while pendientes:
+            simbolo = pendientes.pop()
+            for indice in apariciones.get(simbolo, ()):
+                restantes[indice] -= 1
+                if restantes[indice] == 0:
+                    nt, cuerpo = cabezas[indice]
+                    if nt not in self.anulables:
+                        self.anulables.add(nt)
+                        pendientes.append(nt)
+                        print(f"  {g.nombre(nt)} es anulable (produce '{g.texto(cuerpo)}' que es anulable)")
+
+        print(f"\nSímbolos anulables finales: {self.nombres_ordenados(self.anulables)}")
+        print(f"Símbolos con ε directo: {self.nombres_ordenados(self.epsilon_directos)}")
+
+    def nombres_ordenados(self, simbolos):
+        return sorted(self.gramatica_original.nombre(s) for s in simbolos)
 
     def es_cadena_anulable(self, cadena):
-        if cadena == 'ε':
+        if cadena == self.gramatica_original.EPSILON:
             return True
         return all(simbolo in self.anulables for simbolo in cadena)
 
@@ -114,16 +166,21 @@ class EliminadorEpsilon:
         print(f"\n--- PASO 2: Generar nuevas producciones ---")
 
         total_nuevas = 0
+        g = self.gramatica_original
+
+        producciones = g.producciones
+        if self.umbral_anulables is not None:
+            producciones = self.binarizar_cuerpos_largos(producciones)
 
-        for nt, cuerpos in self.gramatica_original.producciones.items():
-            print(f"\nProcesando {nt}:")
+        for nt, cuerpos in producciones.items():
+            print(f"\nProcesando {g.nombre(nt)}:")
             nuevos_cuerpos = set()
 
             for i, cuerpo in enumerate(cuerpos):
-                print(f"  Producción {i + 1}: {nt} → {cuerpo}")
+                print(f"  Producción {i + 1}: {g.nombre(nt)} → {g.texto(cuerpo)}")
 
-                if cuerpo == 'ε':
-                    nuevos_cuerpos.add('ε')
+                if cuerpo == g.EPSILON:
+                    nuevos_cuerpos.add(g.EPSILON)
                     print(f"    Manteniendo ε temporalmente")
                     continue
 
@@ -135,47 +192,81 @@ class EliminadorEpsilon:
 
                 if not posiciones_anulables:
                     nuevos_cuerpos.add(cuerpo)
-                    print(f"    Sin símbolos anulables: '{cuerpo}'")
+                    print(f"    Sin símbolos anulables: '{g.texto(cuerpo)}'")
                 else:
                     num_anulables = len(posiciones_anulables)
+                    detallar = 2 ** num_anulables <= self.MAX_COMBINACIONES_DETALLE
                     print(f"    Símbolos anulables en posiciones {posiciones_anulables}")
-                    print(f"    Generando 2^{num_anulables} = {2 ** num_anulables} combinaciones:")
+                    print(f"    Generando hasta 2^{num_anulables} = {2 ** num_anulables} combinaciones:")
 
                     combinaciones_generadas = 0
-                    for r in range(num_anulables + 1):
-                        for combo in combinations(posiciones_anulables, r):
-                            nuevo_cuerpo = ""
-                            for k, simbolo in enumerate(cuerpo):
-                                if k not in combo:
-                                    nuevo_cuerpo += simbolo
+                    for nuevo_cuerpo, omitidas in combinaciones_cuerpo(g, cuerpo, posiciones_anulables):
+                        nuevos_cuerpos.add(nuevo_cuerpo)
+                        combinaciones_generadas += 1
 
-                            if nuevo_cuerpo == "":
-                                nuevo_cuerpo = "ε"
+                        if not detallar:
+                            continue
+                        if omitidas:
+                            eliminados = [f"{g.nombre(cuerpo[p])}" for p in sorted(omitidas)]
+                            print(f"      Eliminando {eliminados}: '{g.texto(nuevo_cuerpo)}'")
+                        else:
+                            print(f"      Sin eliminaciones: '{g.texto(nuevo_cuerpo)}'")
 
-                            nuevos_cuerpos.add(nuevo_cuerpo)
-                            combinaciones_generadas += 1
-
-                            if combo:
-                                eliminados = [f"{cuerpo[p]}" for p in combo]
-                                print(f"      Eliminando {eliminados}: '{nuevo_cuerpo}'")
-                            else:
-                                print(f"      Sin eliminaciones: '{nuevo_cuerpo}'")
-
-                    print(f"    Total combinaciones generadas: {combinaciones_generadas}")
+                    print(f"    Total combinaciones distintas generadas: {combinaciones_generadas}")
 
             for nuevo_cuerpo in nuevos_cuerpos:
                 self.nueva_gramatica.agregar_produccion(nt, nuevo_cuerpo)
                 total_nuevas += 1
 
-            print(f"  Total producciones para {nt}: {len(nuevos_cuerpos)}")
+            print(f"  Total producciones para {g.nombre(nt)}: {len(nuevos_cuerpos)}")
 
         print(f"\n✓ Total de producciones generadas: {total_nuevas}")
         self.nueva_gramatica.mostrar("Gramática con Nuevas Producciones")
 
+    def binarizar_cuerpos_largos(self, producciones):
+        """Parte en cadenas X1 H1, H1 → X2 H2, ... los cuerpos con más anulables que el umbral"""
+        g = self.gramatica_original
+        en_uso = set(producciones)
+        for cuerpos in producciones.values():
+            for cuerpo in cuerpos:
+                en_uso.update(cuerpo)
+
+        resultado = {nt: [] for nt in producciones}
+        for nt, cuerpos in producciones.items():
+            for cuerpo in cuerpos:
+                num_anulables = sum(1 for simbolo in cuerpo if simbolo in self.anulables)
+                if cuerpo == g.EPSILON or num_anulables <= self.umbral_anulables:
+                    resultado[nt].append(cuerpo)
+                    continue
+
+                print(f"  Binarizando {g.nombre(nt)} → {g.texto(cuerpo)} ({num_anulables} anulables > {self.umbral_anulables})")
+
+                # Sufijos anulables desde el final: H_i es anulable si todo su sufijo lo es
+                sufijo_anulable = [False] * (len(cuerpo) + 1)
+                sufijo_anulable[len(cuerpo)] = True
+                for j in range(len(cuerpo) - 1, -1, -1):
+                    sufijo_anulable[j] = sufijo_anulable[j + 1] and cuerpo[j] in self.anulables
+
+                cabeza = nt
+                for j in range(len(cuerpo) - 2):
+                    auxiliar = g.crear_auxiliar(en_uso)
+                    self.auxiliares.append(auxiliar)
+                    resultado.setdefault(cabeza, []).append(g.crear_cuerpo((cuerpo[j], auxiliar)))
+                    resultado[auxiliar] = []
+                    if sufijo_anulable[j + 1]:
+                        self.anulables.add(auxiliar)
+                    cabeza = auxiliar
+                resultado[cabeza].append(cuerpo[-2:])
+
+        if self.auxiliares:
+            print(f"  No terminales auxiliares creados: {len(self.auxiliares)}")
+        return resultado
+
     def limpiar_epsilon(self):
         print(f"\n--- PASO 3: Limpiar producciones ε ---")
 
-        gramatica_limpia = Gramatica()
+        g = self.nueva_gramatica
+        gramatica_limpia = g.nueva()
         gramatica_limpia.simbolo_inicial = self.nueva_gramatica.simbolo_inicial
 
         epsilon_removidas = 0
@@ -183,15 +274,15 @@ class EliminadorEpsilon:
 
         for nt, cuerpos in self.nueva_gramatica.producciones.items():
             for cuerpo in cuerpos:
-                if cuerpo == 'ε':
+                if cuerpo == g.EPSILON:
                     if (nt == self.nueva_gramatica.simbolo_inicial and
                             nt in self.epsilon_directos):
                         gramatica_limpia.agregar_produccion(nt, cuerpo)
                         epsilon_mantenidas += 1
-                        print(f"  Manteniendo {nt} → ε (símbolo inicial con ε directo)")
+                        print(f"  Manteniendo {g.nombre(nt)} → ε (símbolo inicial con ε directo)")
                     else:
                         epsilon_removidas += 1
-                        print(f"  Removiendo {nt} → ε")
+                        print(f"  Removiendo {g.nombre(nt)} → ε")
                 else:
                     gramatica_limpia.agregar_produccion(nt, cuerpo)
 
@@ -204,6 +295,139 @@ class EliminadorEpsilon:
         self.nueva_gramatica.mostrar("Gramática Final Sin ε-Producciones")
 
 
+def producciones_utiles(gramatica):
+    """{cabeza: cuerpos} sin los cuerpos que usan no terminales sin producciones.
+
+    Tras eliminar ε, B → ε desaparece pero S → aB conserva la B: ese cuerpo no genera
+    nada. Quitarlo puede dejar otra cabeza sin cuerpos, así que se propaga por lista de trabajo.
+    """
+    g = gramatica
+    vivos = {nt: {i for i in range(len(cuerpos))} for nt, cuerpos in g.producciones.items() if cuerpos}
+    usos = {}
+    muertos = set()
+    pendientes = []
+    for nt, cuerpos in g.producciones.items():
+        for i, cuerpo in enumerate(cuerpos):
+            if cuerpo == g.EPSILON:
+                continue
+            for simbolo in cuerpo:
+                if not g.es_terminal(simbolo):
+                    usos.setdefault(simbolo, []).append((nt, i))
+                    if simbolo not in vivos and simbolo not in muertos:
+                        muertos.add(simbolo)
+                        pendientes.append(simbolo)
+
+    while pendientes:
+        muerto = pendientes.pop()
+        for nt, i in usos.get(muerto, ()):
+            indices = vivos.get(nt)
+            if indices is None or i not in indices:
+                continue
+            indices.discard(i)
+            if not indices:
+                del vivos[nt]
+                pendientes.append(nt)
+
+    return {nt: [cuerpo for i, cuerpo in enumerate(cuerpos) if i in vivos[nt]]
+            for nt, cuerpos in g.producciones.items() if nt in vivos}
+
+
+def calcular_anulables(gramatica):
+    """Conjunto de no terminales anulables, sin la salida detallada de EliminadorEpsilon"""
+    import io
+    from contextlib import redirect_stdout
+
+    eliminador = EliminadorEpsilon(gramatica)
+    with redirect_stdout(io.StringIO()):
+        eliminador.encontrar_anulables()
+    return eliminador.anulables
+
+
+def crear_gramatica(producciones):
+    """Gramatica a partir de pares (no terminal, cuerpo); el primero da el símbolo inicial"""
+    gramatica = Gramatica()
+    for nt, cuerpo in producciones:
+        gramatica.agregar_produccion(nt, cuerpo)
+    return gramatica
+
+
+def generar_gramatica_cadena(n):
+    """Gramática con una cadena de n no terminales anulables: X0 → X1a | X1, ..., Xn → ε"""
+    gramatica = Gramatica()
+    simbolos = [chr(0x4E00 + i) for i in range(n + 1)]
+    for actual, siguiente in zip(simbolos, simbolos[1:]):
+        gramatica.agregar_produccion(actual, siguiente + 'a')
+        gramatica.agregar_produccion(actual, siguiente)
+    gramatica.agregar_produccion(simbolos[-1], 'ε')
+    return gramatica
+
+
+def generar_gramatica_aleatoria(n, cuerpos_por_nt=4, longitud=5, semilla=0):
+    """Gramática aleatoria con n no terminales (símbolos Unicode de un carácter)"""
+    import random
+
+    azar = random.Random(semilla)
+    no_terminales = [chr(0x4E00 + i) for i in range(n)]
+    terminales = 'abcdefgh'
+    gramatica = Gramatica()
+    for nt in no_terminales:
+        for _ in range(cuerpos_por_nt):
+            cuerpo = ''.join(azar.choice(no_terminales) if azar.random() < 0.7 else azar.choice(terminales)
+                             for _ in range(azar.randint(1, longitud)))
+            gramatica.agregar_produccion(nt, cuerpo)
+        if azar.random() < 0.1:
+            gramatica.agregar_produccion(nt, 'ε')
+    return gramatica
+
+
+def benchmark_eliminacion_acotada(longitudes=(10, 16, 20), umbral=4):
+    """Compara la expansión 2^k con la binarización acotada en un cuerpo de k anulables"""
+    import io
+    import time
+    from contextlib import redirect_stdout
+
+    print("=== BENCHMARK ELIMINACIÓN ε ACOTADA ===")
+    for k in longitudes:
+        for modo in (None, umbral):
+            if modo is None and k > 16:
+                print(f"  k={k:<3} sin umbral: omitido (2^{k} cuerpos)")
+                continue
+            gramatica = Gramatica()
+            anulables = [chr(0x4E00 + i) for i in range(k)]
+            gramatica.agregar_produccion('S', ''.join(anulables) + 'b')
+            for nt in anulables:
+                gramatica.agregar_produccion(nt, 'a')
+                gramatica.agregar_produccion(nt, 'ε')
+            eliminador = EliminadorEpsilon(gramatica, umbral_anulables=modo)
+            inicio = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                resultado = eliminador.eliminar_producciones_epsilon()
+            tiempo = time.perf_counter() - inicio
+            producciones = sum(len(c) for c in resultado.producciones.values())
+            etiqueta = "sin umbral" if modo is None else f"umbral={modo}"
+            print(f"  k={k:<3} {etiqueta:<10} producciones={producciones:<7} {tiempo * 1000:.1f} ms")
+
+
+def benchmark_anulables(tamanos=(1000, 5000, 20000)):
+    """Mide encontrar_anulables en gramáticas generadas con miles de no terminales"""
+    import io
+    import time
+    from contextlib import redirect_stdout
+
+    print("=== BENCHMARK ANULABLES ===")
+    for n in tamanos:
+        for nombre, gramatica in (("cadena", generar_gramatica_cadena(n)),
+                                  ("aleatoria", generar_gramatica_aleatoria(n))):
+            producciones = sum(len(c) for c in gramatica.producciones.values())
+            eliminador = EliminadorEpsilon(gramatica)
+            inicio = time.perf_counter()
+            with redirect_stdout(io.StringIO()):
+                eliminador.encontrar_anulables()
+            tiempo = time.perf_counter() - inicio
+            print(f"  {nombre:<9} n={n:<6} producciones={producciones:<7} "
+                  f"anulables={len(eliminador.anulables):<6} {tiempo * 1000:.1f} ms")
+
+
 def cargar_gramatica_desde_archivo(nombre_archivo):
     import os
 
@@ -241,3 +465,8 @@ def cargar_gramatica_desde_archivo(nombre_archivo):
                 print(f"  Error en línea {linea_num}: falta flecha →")
 
     return gramatica
+
+
+if __name__ == "__main__":
+    benchmark_anulables()
+    benchmark_eliminacion_acotada()
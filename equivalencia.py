@@ -0,0 +1,146 @@
+from collections import deque
+
+# Estado sumidero implícito para transiciones ausentes en AFD parciales
+SUMIDERO = None
+
+
+class UnionFind:
+    def __init__(self):
+        self.padre = {}
+        self.rango = {}
+
+    def encontrar(self, x):
+        if x not in self.padre:
+            self.padre[x] = x
+            self.rango[x] = 0
+            return x
+
+        raiz = x
+        while self.padre[raiz] != raiz:
+            raiz = self.padre[raiz]
+
+        # Compresión de caminos
+        while self.padre[x] != raiz:
+            self.padre[x], x = raiz, self.padre[x]
+        return raiz
+
+    def unir(self, a, b):
+        """Une las clases de a y b; devuelve False si ya estaban juntas"""
+        raiz_a = self.encontrar(a)
+        raiz_b = self.encontrar(b)
+        if raiz_a == raiz_b:
+            return False
+
+        if self.rango[raiz_a] < self.rango[raiz_b]:
+            raiz_a, raiz_b = raiz_b, raiz_a
+        self.padre[raiz_b] = raiz_a
+        if self.rango[raiz_a] == self.rango[raiz_b]:
+            self.rango[raiz_a] += 1
+        return True
+
+
+def siguiente_estado(afd, estado, simbolo):
+    """Transición de un AFD parcial; las ausentes van al SUMIDERO"""
+    if estado is SUMIDERO:
+        return SUMIDERO
+    return afd.transitions.get((estado, simbolo), SUMIDERO)
+
+
+def reconstruir_cadena(padres, par):
+    """Recorre los punteros (par_anterior, símbolo) del BFS hasta el par inicial"""
+    simbolos = []
+    while padres[par] is not None:
+        par, simbolo = padres[par]
+        simbolos.append(simbolo)
+    return ''.join(reversed(simbolos))
+
+
+def equivalentes(afd1, afd2):
+    """Hopcroft–Karp: compara L(afd1) y L(afd2) sin minimizar ni construir el producto completo.
+
+    Devuelve (True, None) si son equivalentes o (False, contraejemplo), donde el
+    contraejemplo es una cadena de longitud mínima aceptada por solo uno de los dos.
+    """
+    alfabeto = sorted(afd1.alphabet | afd2.alphabet)
+    inicio = (afd1.start_state, afd2.start_state)
+
+    # Los estados se etiquetan con el índice del autómata para no mezclar nombres
+    clases = UnionFind()
+    clases.unir((1, inicio[0]), (2, inicio[1]))
+
+    padres = {inicio: None}
+    cola = deque([inicio])
+
+    # BFS: el primer par en desacuerdo da un contraejemplo más corto
+    while cola:
+        p, q = par = cola.popleft()
+        if (p in afd1.final_states) != (q in afd2.final_states):
+            return False, reconstruir_cadena(padres, par)
+
+        for simbolo in alfabeto:
+            siguiente = (siguiente_estado(afd1, p, simbolo), siguiente_estado(afd2, q, simbolo))
+            if clases.unir((1, siguiente[0]), (2, siguiente[1])):
+                padres[siguiente] = (par, simbolo)
+                cola.append(siguiente)
+
+    return True, None
+
+
+def incluido(afd1, afd2):
+    """Verifica L(afd1) ⊆ L(afd2) recorriendo bajo demanda los pares alcanzables del producto.
+
+    Devuelve (True, None) o (False, contraejemplo) con la cadena más corta aceptada
+    por afd1 y rechazada por afd2.
+    """
+    alfabeto = sorted(afd1.alphabet | afd2.alphabet)
+    inicio = (afd1.start_state, afd2.start_state)
+
+    padres = {inicio: None}
+    cola = deque([inicio])
+
+    while cola:
+        p, q = par = cola.popleft()
+        if p in afd1.final_states and q not in afd2.final_states:
+            return False, reconstruir_cadena(padres, par)
+
+        # Desde el sumidero de afd1 no se acepta nada más
+        if p is SUMIDERO:
+            continue
+
+        for simbolo in alfabeto:
+            siguiente = (siguiente_estado(afd1, p, simbolo), siguiente_estado(afd2, q, simbolo))
+            if siguiente not in padres:
+                padres[siguiente] = (par, simbolo)
+                cola.append(siguiente)
+
+    return True, None
+
+
+def test_equivalencia():
+    """Compara pares de expresiones regulares"""
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+
+    casos = [
+        ("(a|b)*", "(a*b*)*"),
+        ("(a|b)*abb", "(a|b)*abb(a|b)*"),
+        ("a(ba)*", "(ab)*a"),
+        ("a+", "aa*"),
+    ]
+
+    for regex1, regex2 in casos:
+        afds = []
+        for regex in (regex1, regex2):
+            afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+            afds.append(Subconjuntos(afn).convertir())
+
+        iguales, contraejemplo = equivalentes(afds[0], afds[1])
+        sub, contra_sub = incluido(afds[0], afds[1])
+        print(f"\n{regex1}  vs  {regex2}")
+        print(f"  Equivalentes: {iguales}" + ("" if iguales else f" (contraejemplo: '{contraejemplo}')"))
+        print(f"  L1 ⊆ L2: {sub}" + ("" if sub else f" (contraejemplo: '{contra_sub}')"))
+
+
+if __name__ == "__main__":
+    test_equivalencia()
@@ -0,0 +1,253 @@
+import re
+import sys
+import time
+from xml.sax.saxutils import escape, quoteattr
+from automata import AFN
+
+PATRON_NUMERO = re.compile(r'(\d+)$')
+
+
+def numero_estado(estado):
+    """Número de un estado: el id de un Estado del AFN o los dígitos finales del nombre (S12, M3)"""
+    if hasattr(estado, 'id'):
+        return estado.id
+    coincidencia = PATRON_NUMERO.search(str(estado))
+    return int(coincidencia.group(1)) if coincidencia else None
+
+
+def por_rangos(tamano):
+    """Agrupa los estados en bloques consecutivos de tamano números: 0..999, 1000..1999..."""
+    def grupo(estado):
+        numero = numero_estado(estado)
+        if numero is None:
+            return None
+        base = numero - numero % tamano
+        return f"{base}..{base + tamano - 1}"
+    return grupo
+
+
+def comprimir_simbolos(simbolos):
+    """Etiqueta de una arista con varios símbolos: ordena y resume corridas como a-z"""
+    unicos = sorted(set(simbolos), key=lambda s: (len(s) != 1, ord(s[0]) if len(s) == 1 else 0, s))
+    partes = []
+    i = 0
+    while i < len(unicos):
+        j = i
+        if len(unicos[i]) == 1:
+            while j + 1 < len(unicos) and len(unicos[j + 1]) == 1 and ord(unicos[j + 1]) == ord(unicos[j]) + 1:
+                j += 1
+        if j - i >= 2:
+            partes.append(f"{unicos[i]}-{unicos[j]}")
+        else:
+            partes.extend(unicos[i:j + 1])
+        i = j + 1
+    return ','.join(partes)
+
+
+def aristas(automata):
+    """(origen, destino, símbolos) con las aristas paralelas ya fusionadas, origen por origen"""
+    if isinstance(automata, AFN):
+        for origen, por_simbolo in automata.transitions.items():
+            destinos = {}
+            for simbolo, conjunto in por_simbolo.items():
+                for destino in conjunto:
+                    etiqueta = simbolo
+                    if simbolo == '#':
+                        ranura = automata.etiquetas.get((origen, destino))
+                        etiqueta = 'ε' if ranura is None else f"ε[ranura {ranura}]"
+                    destinos.setdefault(destino, []).append(etiqueta)
+            for destino, accion, contador, minimo, maximo in automata.transiciones_contador.get(origen, ()):
+                destinos.setdefault(destino, []).append(f"ε[c{contador} {accion} {{{minimo},{maximo}}}]")
+            for destino, simbolos in destinos.items():
+                yield origen, destino, simbolos
+        return
+
+    # AFD: una pasada para agrupar {(origen, símbolo): destino} por origen
+    por_origen = {}
+    for (origen, simbolo), destino in automata.transitions.items():
+        por_origen.setdefault(origen, {}).setdefault(destino, []).append(simbolo)
+    for origen, destinos in por_origen.items():
+        for destino, simbolos in destinos.items():
+            yield origen, destino, simbolos
+
+
+def agrupar_estados(automata, grupo):
+    """{clave de grupo: [estados]} ordenados por número; clave None = sin grupo"""
+    grupos = {}
+    for estado in automata.states:
+        grupos.setdefault(grupo(estado) if grupo else None, []).append(estado)
+    orden = lambda e: (numero_estado(e) is None, numero_estado(e) or 0, str(e))
+    for estados in grupos.values():
+        estados.sort(key=orden)
+    return dict(sorted(grupos.items(), key=lambda t: orden(t[1][0])))
+
+
+def fusionar_grupos(automata, grupo):
+    """Aristas entre grupos colapsados: {(grupo origen, grupo destino): (símbolos, cantidad)}"""
+    fusionadas = {}
+    for origen, destino, simbolos in aristas(automata):
+        clave = (grupo(origen) or str(origen), grupo(destino) or str(destino))
+        conjunto, cantidad = fusionadas.get(clave, (set(), 0))
+        conjunto.update(simbolos)
+        fusionadas[clave] = (conjunto, cantidad + 1)
+    return fusionadas
+
+
+def _abrir(destino):
+    if hasattr(destino, 'write'):
+        return destino, False
+    return open(destino, 'w', encoding='utf-8'), True
+
+
+def _dot(texto):
+    return '"' + str(texto).replace('\\', '\\\\').replace('"', '\\"') + '"'
+
+
+def exportar_dot(automata, destino, grupo=None, colapsar=False, titulo=None):
+    """Escribe el autómata en formato DOT de Graphviz sin calcular un layout.
+
+    grupo: función estado -> clave (por ejemplo por_rangos(1000)); cada clave es un cluster.
+    colapsar: cada grupo se dibuja como un único nodo y sus aristas se fusionan.
+    Devuelve (nodos, aristas) escritos.
+    """
+    salida, propia = _abrir(destino)
+    escribir = salida.write
+    nodos = aristas_escritas = 0
+    try:
+        escribir(f"digraph {_dot(titulo or type(automata).__name__)} {{\n")
+        escribir("  rankdir=LR;\n  node [shape=circle];\n  __inicio [shape=point];\n")
+        inicio = automata.start_state
+        grupos = agrupar_estados(automata, grupo)
+
+        if grupo and colapsar:
+            for clave, estados in grupos.items():
+                if clave is None:
+                    for estado in estados:
+                        forma = ', shape=doublecircle' if estado in automata.final_states else ''
+                        escribir(f"  {_dot(estado)} [label={_dot(estado)}{forma}];\n")
+                        nodos += 1
+                    continue
+                finales = sum(1 for e in estados if e in automata.final_states)
+                escribir(f"  {_dot(clave)} [shape=box, label={_dot(f'{clave} ({len(estados)} estados, {finales} finales)')}"
+                         f"{', peripheries=2' if finales else ''}];\n")
+                nodos += 1
+            if inicio is not None:
+                escribir(f"  __inicio -> {_dot(grupo(inicio) or inicio)};\n")
+            for (origen, destino), (simbolos, cantidad) in fusionar_grupos(automata, grupo).items():
+                etiqueta = comprimir_simbolos(simbolos) + (f" ×{cantidad}" if cantidad > 1 else "")
+                escribir(f"  {_dot(origen)} -> {_dot(destino)} [label={_dot(etiqueta)}];\n")
+                aristas_escritas += 1
+        else:
+            for clave, estados in grupos.items():
+                sangria = "  "
+                if clave is not None:
+                    escribir(f"  subgraph {_dot('cluster_' + str(clave))} {{\n    label={_dot(clave)};\n")
+                    sangria = "    "
+                for estado in estados:
+                    if estado in automata.final_states:
+                        escribir(f"{sangria}{_dot(estado)} [shape=doublecircle];\n")
+                    else:
+                        escribir(f"{sangria}{_dot(estado)};\n")
+                    nodos += 1
+                if clave is not None:
+                    escribir("  }\n")
+            if inicio is not None:
+                escribir(f"  __inicio -> {_dot(inicio)};\n")
+            for origen, destino, simbolos in aristas(automata):
+                escribir(f"  {_dot(origen)} -> {_dot(destino)} [label={_dot(comprimir_simbolos(simbolos))}];\n")
+                aristas_escritas += 1
+        escribir("}\n")
+    finally:
+        if propia:
+            salida.close()
+    return nodos, aristas_escritas
+
+
+def exportar_graphml(automata, destino, grupo=None):
+    """Escribe el autómata en GraphML; el grupo de cada estado va como atributo 'grupo'"""
+    salida, propia = _abrir(destino)
+    escribir = salida.write
+    nodos = aristas_escritas = 0
+    try:
+        escribir('<?xml version="1.0" encoding="UTF-8"?>\n'
+                 '<graphml xmlns="http://graphml.graphdrawing.org/xmlns">\n'
+                 '  <key id="inicial" for="node" attr.name="inicial" attr.type="boolean"/>\n'
+                 '  <key id="final" for="node" attr.name="final" attr.type="boolean"/>\n'
+                 '  <key id="grupo" for="node" attr.name="grupo" attr.type="string"/>\n'
+                 '  <key id="simbolos" for="edge" attr.name="simbolos" attr.type="string"/>\n'
+                 '  <graph edgedefault="directed">\n')
+        for estado in automata.states:
+            datos = ''
+            if estado == automata.start_state:
+                datos += '<data key="inicial">true</data>'
+            if estado in automata.final_states:
+                datos += '<data key="final">true</data>'
+            clave = grupo(estado) if grupo else None
+            if clave is not None:
+                datos += f'<data key="grupo">{escape(str(clave))}</data>'
+            escribir(f'    <node id={quoteattr(str(estado))}>{datos}</node>\n')
+            nodos += 1
+        for origen, destino, simbolos in aristas(automata):
+            escribir(f'    <edge source={quoteattr(str(origen))} target={quoteattr(str(destino))}>'
+                     f'<data key="simbolos">{escape(comprimir_simbolos(simbolos))}</data></edge>\n')
+            aristas_escritas += 1
+        escribir('  </graph>\n</graphml>\n')
+    finally:
+        if propia:
+            salida.close()
+    return nodos, aristas_escritas
+
+
+def afd_sintetico(estados, alfabeto="0123456789abcdef"):
+    """AFD grande de prueba: cada estado avanza por dígitos y vuelve al inicio por letras"""
+    from automata import AFD
+
+    afd = AFD()
+    afd.alphabet = set(alfabeto)
+    for i in range(estados):
+        afd.states.add(f"S{i}")
+        for simbolo in alfabeto:
+            destino = (i + 1) % estados if simbolo.isdigit() else 0
+            afd.transitions[(f"S{i}", simbolo)] = f"S{destino}"
+    afd.start_state = "S0"
+    afd.final_states = {f"S{i}" for i in range(0, estados, 7)}
+    return afd
+
+
+def benchmark_exportar(estados=100000, ruta_base="automata_grande"):
+    """Exporta un AFD de muchos estados a DOT (plano y colapsado por rangos) y a GraphML"""
+    import io
+    import os
+    from contextlib import redirect_stdout
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+
+    print("=== EXPORTACIÓN DOT / GRAPHML ===")
+    with redirect_stdout(io.StringIO()):
+        afn = Thompson().construir_desde_postfix(infix_to_postfix("(a|b)*abb(0|1|2|3|4|5)+"))
+    texto = io.StringIO()
+    nodos, num_aristas = exportar_dot(afn, texto)
+    print(f"AFN de ejemplo: {nodos} nodos, {num_aristas} aristas, {len(texto.getvalue())} bytes de DOT")
+
+    afd = afd_sintetico(estados)
+    print(f"\nAFD sintético: {len(afd.states)} estados, {len(afd.transitions)} transiciones")
+    for nombre, ruta, exportar in (
+            ("DOT plano", ruta_base + ".dot", lambda r: exportar_dot(afd, r)),
+            ("DOT por rangos de 1000", ruta_base + "_rangos.dot",
+             lambda r: exportar_dot(afd, r, grupo=por_rangos(1000))),
+            ("DOT colapsado", ruta_base + "_colapsado.dot",
+             lambda r: exportar_dot(afd, r, grupo=por_rangos(1000), colapsar=True)),
+            ("GraphML", ruta_base + ".graphml", lambda r: exportar_graphml(afd, r, grupo=por_rangos(1000)))):
+        inicio = time.perf_counter()
+        nodos, num_aristas = exportar(ruta)
+        tiempo = time.perf_counter() - inicio
+        print(f"  {nombre:<24} {nodos:>7} nodos {num_aristas:>7} aristas  "
+              f"{os.path.getsize(ruta) / 1024 / 1024:6.1f} MiB  {tiempo:.2f} s")
+        os.remove(ruta)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        benchmark_exportar(int(sys.argv[1]))
+    else:
+        benchmark_exportar()
@@ -0,0 +1,174 @@
+import time
+import keyword
+
+# Con más estados que este límite, la cadena de if por estado pierde frente al diccionario
+MAX_ESTADOS_RAMAS = 12
+# Nombres que usa el propio código generado y que la función no puede tapar
+NOMBRES_INTERNOS = frozenset({'_crear', 'tabla', 'finales', 'fila', 'estado', 'cadena', 'c'})
+
+
+def huella(afd):
+    """Identifica el contenido del AFD para invalidar el código generado si cambia"""
+    return hash((afd.start_state, frozenset(afd.final_states), frozenset(afd.transitions.items())))
+
+
+def validar_nombre(nombre):
+    """El nombre va tal cual al código que se pasa a exec: solo se aceptan identificadores"""
+    if not (isinstance(nombre, str) and nombre.isidentifier() and not keyword.iskeyword(nombre)):
+        raise ValueError(f"Nombre de función inválido: {nombre!r}")
+    if nombre in NOMBRES_INTERNOS:
+        raise ValueError(f"Nombre de función reservado por el código generado: {nombre!r}")
+
+
+def numerar_estados(afd):
+    """Estados como enteros: el inicial es 0 y el resto en orden de recorrido BFS"""
+    salidas = {}
+    for (origen, simbolo), destino in afd.transitions.items():
+        salidas.setdefault(origen, []).append((simbolo, destino))
+
+    numeros = {afd.start_state: 0}
+    orden = [afd.start_state]
+    for estado in orden:
+        for _, destino in sorted(salidas.get(estado, ()), key=lambda t: repr(t[0])):
+            if destino not in numeros:
+                numeros[destino] = len(orden)
+                orden.append(destino)
+    return numeros, orden, salidas
+
+
+def generar_fuente(afd, nombre='coincide', modo=None):
+    """Código fuente de una función nombre(cadena) -> bool especializada para el AFD.
+
+    modo 'ramas': un if por estado y por símbolo, sin estructuras en tiempo de ejecución.
+    modo 'diccionario': una tupla de diccionarios por estado como constante cerrada.
+    Por defecto se elige según la cantidad de estados alcanzables.
+    """
+    validar_nombre(nombre)
+    numeros, orden, salidas = numerar_estados(afd)
+    finales = sorted(numeros[e] for e in afd.final_states if e in numeros)
+    if modo is None:
+        modo = 'ramas' if len(orden) <= MAX_ESTADOS_RAMAS else 'diccionario'
+
+    lineas = [f"# AFD de {len(orden)} estados, modo {modo}"]
+    if modo == 'diccionario':
+        filas = []
+        for estado in orden:
+            pares = ', '.join(f"{simbolo!r}: {numeros[destino]}"
+                              for simbolo, destino in sorted(salidas.get(estado, ()), key=lambda t: repr(t[0])))
+            filas.append(f"    {{{pares}}},")
+        lineas += ["def _crear():",
+                   "    tabla = ("] + ["    " + fila for fila in filas] + [
+                   "    )",
+                   f"    finales = frozenset({finales!r})",
+                   "",
+                   f"    def {nombre}(cadena):",
+                   "        fila = tabla[0]",
+                   "        estado = 0",
+                   "        for c in cadena:",
+                   "            estado = fila.get(c)",
+                   "            if estado is None:",
+                   "                return False",
+                   "            fila = tabla[estado]",
+                   "        return estado in finales",
+                   "",
+                   f"    return {nombre}",
+                   "",
+                   f"{nombre} = _crear()"]
+    elif modo == 'ramas':
+        lineas += [f"def {nombre}(cadena):",
+                   "    estado = 0",
+                   "    for c in cadena:"]
+        for i, estado in enumerate(orden):
+            lineas.append(f"        {'if' if i == 0 else 'elif'} estado == {i}:")
+            transiciones = sorted(salidas.get(estado, ()), key=lambda t: repr(t[0]))
+            for j, (simbolo, destino) in enumerate(transiciones):
+                lineas.append(f"            {'if' if j == 0 else 'elif'} c == {simbolo!r}:")
+                lineas.append(f"                estado = {numeros[destino]}")
+            if transiciones:
+                lineas.append("            else:")
+                lineas.append("                return False")
+            else:
+                lineas.append("            return False")
+        condicion = ' or '.join(f"estado == {f}" for f in finales) or 'False'
+        lineas.append(f"    return {condicion}")
+    else:
+        raise ValueError(f"Modo desconocido: '{modo}'")
+
+    return '\n'.join(lineas) + '\n'
+
+
+def compilar_afd(afd, nombre='coincide', modo=None):
+    """Genera, compila y guarda en afd.codigo_generado el reconocedor especializado.
+
+    afd.codigo_generado es {(huella, modo, nombre): (fuente, función)}: si el AFD no
+    cambió desde la última compilación con ese modo y nombre se devuelve la función guardada.
+    """
+    validar_nombre(nombre)
+    clave = (huella(afd), modo, nombre)
+    guardado = (afd.codigo_generado or {}).get(clave)
+    if guardado is not None:
+        return guardado[1]
+    # Las funciones de una huella anterior ya no corresponden al AFD
+    afd.codigo_generado = {k: v for k, v in (afd.codigo_generado or {}).items() if k[0] == clave[0]}
+
+    fuente = generar_fuente(afd, nombre, modo)
+    espacio = {}
+    exec(compile(fuente, f"<afd {nombre}>", 'exec'), espacio)
+    funcion = espacio[nombre]
+    afd.codigo_generado[clave] = (fuente, funcion)
+    return funcion
+
+
+def simular_tabla(afd, cadena):
+    """Intérprete por tabla: una búsqueda en afd.transitions por carácter"""
+    transiciones = afd.transitions
+    estado = afd.start_state
+    for c in cadena:
+        estado = transiciones.get((estado, c))
+        if estado is None:
+            return False
+    return estado in afd.final_states
+
+
+def benchmark_generador(cantidad=200000, semilla=0):
+    """Intérprete por tabla frente a las dos variantes generadas, con cadenas cortas"""
+    import io
+    import random
+    from contextlib import redirect_stdout
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+    from minimizacion import MinimizacionAFD
+
+    generador = random.Random(semilla)
+    print("=== BENCHMARK CÓDIGO GENERADO ===")
+    for regex, alfabeto in [("(a|b)*abb(a|b)*", "ab"),
+                            (r"if\((a|x|t)+\)\{y\}(else\{n\})?", "if(atx){y}else{n}"),
+                            ("(0|1|2){1,3}", "0123")]:
+        with redirect_stdout(io.StringIO()):
+            afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+            afd = MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+
+        entradas = [''.join(generador.choice(alfabeto) for _ in range(generador.randint(0, 12)))
+                    for _ in range(cantidad)]
+
+        inicio = time.perf_counter()
+        esperado = [simular_tabla(afd, e) for e in entradas]
+        tiempo_tabla = time.perf_counter() - inicio
+        print(f"\n{regex}: {len(afd.states)} estados")
+        print(f"  tabla          {tiempo_tabla * 1000:.0f} ms")
+
+        for modo in ('ramas', 'diccionario'):
+            inicio = time.perf_counter()
+            funcion = compilar_afd(afd, modo=modo)
+            tiempo_compilacion = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            obtenido = [funcion(e) for e in entradas]
+            tiempo = time.perf_counter() - inicio
+            print(f"  {modo:<14} {tiempo * 1000:.0f} ms  ({tiempo_tabla / tiempo:.1f}x, "
+                  f"compilación {tiempo_compilacion * 1000:.1f} ms, mismos resultados: {obtenido == esperado})")
+
+
+if __name__ == "__main__":
+    benchmark_generador()
@@ -0,0 +1,225 @@
+from array import array
+
+# Banderas por símbolo en GramaticaCompacta.clases
+NO_TERMINAL = 1
+TERMINAL = 2
+
+
+class TablaSimbolos:
+    """Internado de nombres de símbolo a ids enteros pequeños"""
+
+    def __init__(self):
+        self.nombres = []
+        self.ids = {}
+
+    def internar(self, nombre):
+        id_simbolo = self.ids.get(nombre)
+        if id_simbolo is None:
+            id_simbolo = len(self.nombres)
+            self.ids[nombre] = id_simbolo
+            self.nombres.append(nombre)
+        return id_simbolo
+
+    def __len__(self):
+        return len(self.nombres)
+
+
+def tokens_de(gramatica, entrada):
+    """Tokens de una entrada: una cadena se toma carácter a carácter; en GramaticaCompacta
+    se separa por espacios y los nombres se traducen a ids"""
+    tabla = getattr(gramatica, 'tabla', None)
+    if tabla is None:
+        return list(entrada)
+    if isinstance(entrada, str):
+        entrada = entrada.split()
+    return [tabla.ids.get(t, t) for t in entrada]
+
+
+class GramaticaCompacta:
+    """Gramática con símbolos internados y cuerpos guardados en una sola tabla de producciones.
+
+    Producción i: cabezas[i] → cuerpos[inicios[i]:inicios[i + 1]]. Los cuerpos vacíos
+    representan ε. Cualquier nombre de símbolo es válido, incluidos los de varios caracteres.
+    Ofrece la misma interfaz que Gramatica para que EliminadorEpsilon trabaje sobre ella.
+    """
+    EPSILON = ()
+
+    def __init__(self, tabla=None):
+        self.tabla = tabla if tabla is not None else TablaSimbolos()
+        self.cabezas = array('i')
+        self.inicios = array('i', [0])
+        self.cuerpos = array('i')
+        self.simbolo_inicial = None
+        # clases[i]: banderas NO_TERMINAL / TERMINAL del símbolo i (un byte por símbolo)
+        self.clases = bytearray()
+        self._por_cabeza = None
+
+    def nueva(self):
+        """Gramática vacía que comparte la tabla de símbolos y conserva qué símbolos son no terminales"""
+        nueva = GramaticaCompacta(self.tabla)
+        nueva.clases = bytearray(clase & NO_TERMINAL for clase in self.clases)
+        return nueva
+
+    def interno(self, simbolo):
+        """Id de un símbolo dado por nombre; los ids ya internados se aceptan tal cual"""
+        if isinstance(simbolo, int):
+            return simbolo
+        return self.tabla.internar(simbolo)
+
+    def separar_cuerpo(self, cuerpo):
+        """Ids de un cuerpo dado como tupla de ids, secuencia de nombres o texto.
+
+        En texto, los símbolos van separados por espacios; sin espacios cada carácter
+        es un símbolo (formato de Gramatica). 'ε' o vacío es el cuerpo vacío.
+        """
+        if isinstance(cuerpo, tuple) and (not cuerpo or isinstance(cuerpo[0], int)):
+            # Tupla de ids ya internados (lo que produce crear_cuerpo)
+            return cuerpo
+        if isinstance(cuerpo, str):
+            cuerpo = cuerpo.strip()
+            if cuerpo in ('', 'ε'):
+                return ()
+            cuerpo = cuerpo.split() if any(c.isspace() for c in cuerpo) else list(cuerpo)
+        return tuple(self.interno(simbolo) for simbolo in cuerpo if simbolo != 'ε')
+
+    def crear_cuerpo(self, simbolos):
+        return tuple(simbolos)
+
+    def agregar_produccion(self, no_terminal, cuerpo):
+        cabeza = self.interno(no_terminal)
+        ids_cuerpo = self.separar_cuerpo(cuerpo)
+
+        self.cabezas.append(cabeza)
+        self.cuerpos.extend(ids_cuerpo)
+        self.inicios.append(len(self.cuerpos))
+
+        clases = self.clases
+        faltantes = len(self.tabla.nombres) - len(clases)
+        if faltantes > 0:
+            clases.extend(bytes(faltantes))
+        clases[cabeza] = NO_TERMINAL
+        for simbolo in ids_cuerpo:
+            if not clases[simbolo] & NO_TERMINAL:
+                clases[simbolo] = TERMINAL
+
+        if self.simbolo_inicial is None:
+            self.simbolo_inicial = cabeza
+        self._por_cabeza = None
+
+    def cuerpo(self, indice):
+        return tuple(self.cuerpos[self.inicios[indice]:self.inicios[indice + 1]])
+
+    def __len__(self):
+        return len(self.cabezas)
+
+    @property
+    def producciones(self):
+        """Vista {cabeza: [cuerpos]} con ids, construida una vez por modificación"""
+        if self._por_cabeza is None:
+            por_cabeza = {}
+            for indice, cabeza in enumerate(self.cabezas):
+                por_cabeza.setdefault(cabeza, []).append(self.cuerpo(indice))
+            self._por_cabeza = por_cabeza
+        return self._por_cabeza
+
+    def es_no_terminal(self, simbolo):
+        return simbolo < len(self.clases) and self.clases[simbolo] == NO_TERMINAL
+
+    def es_terminal(self, simbolo):
+        # Un símbolo que luego aparece como cabeza deja de ser terminal
+        return simbolo < len(self.clases) and self.clases[simbolo] == TERMINAL
+
+    @property
+    def no_terminales(self):
+        return {s for s, clase in enumerate(self.clases) if clase == NO_TERMINAL}
+
+    @property
+    def terminales(self):
+        return {s for s, clase in enumerate(self.clases) if clase == TERMINAL}
+
+    def crear_auxiliar(self, en_uso):
+        """No terminal auxiliar nuevo con nombre de varios caracteres"""
+        contador = len(self.tabla)
+        while f"H{contador}" in self.tabla.ids:
+            contador += 1
+        auxiliar = self.tabla.internar(f"H{contador}")
+        en_uso.add(auxiliar)
+        return auxiliar
+
+    def nombre(self, simbolo):
+        return self.tabla.nombres[simbolo]
+
+    def texto(self, cuerpo):
+        if not cuerpo:
+            return 'ε'
+        nombres = self.tabla.nombres
+        return ' '.join([nombres[s] for s in cuerpo])
+
+    def mostrar(self, titulo="Gramática"):
+        print(f"\n=== {titulo} ===")
+        for nt in sorted(self.producciones, key=self.nombre):
+            cuerpos = " | ".join(self.texto(c) for c in self.producciones[nt])
+            print(f"{self.nombre(nt)} → {cuerpos}")
+
+    @classmethod
+    def desde_gramatica(cls, gramatica):
+        """Convierte una Gramatica de cuerpos-cadena (un carácter por símbolo)"""
+        compacta = cls()
+        if gramatica.simbolo_inicial is not None:
+            compacta.simbolo_inicial = compacta.interno(gramatica.simbolo_inicial)
+        for nt, cuerpos in gramatica.producciones.items():
+            for cuerpo in cuerpos:
+                compacta.agregar_produccion(nt, list(cuerpo) if cuerpo != 'ε' else ())
+        return compacta
+
+
+def cargar_gramatica_compacta_desde_archivo(nombre_archivo):
+    """Carga 'A → x Y z | ε' con símbolos de varios caracteres separados por espacios"""
+    gramatica = GramaticaCompacta()
+    with open(nombre_archivo, 'r', encoding='utf-8') as archivo:
+        for linea_num, linea in enumerate(archivo, 1):
+            linea = linea.strip()
+            if not linea or linea.startswith('#'):
+                continue
+
+            partes = linea.split('→')
+            if len(partes) != 2 or not partes[0].strip():
+                raise ValueError(f"Línea {linea_num}: formato incorrecto - '{linea}'")
+
+            no_terminal = partes[0].strip()
+            for cuerpo in partes[1].split('|'):
+                gramatica.agregar_produccion(no_terminal, cuerpo.split())
+
+    return gramatica
+
+
+def benchmark_representacion(n=20000):
+    """Compara memoria y tiempo de EliminadorEpsilon entre Gramatica y GramaticaCompacta"""
+    import io
+    import time
+    import tracemalloc
+    from contextlib import redirect_stdout
+    from eliminador_epsilon import EliminadorEpsilon, generar_gramatica_aleatoria
+
+    print("=== BENCHMARK REPRESENTACIÓN DE GRAMÁTICAS ===")
+    original = generar_gramatica_aleatoria(n)
+
+    for nombre, construir in (("Gramatica", lambda: generar_gramatica_aleatoria(n)),
+                              ("GramaticaCompacta", lambda: GramaticaCompacta.desde_gramatica(original))):
+        tracemalloc.start()
+        gramatica = construir()
+        memoria = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        inicio = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            resultado = EliminadorEpsilon(gramatica, umbral_anulables=4).eliminar_producciones_epsilon()
+        tiempo = time.perf_counter() - inicio
+
+        producciones = sum(len(c) for c in resultado.producciones.values())
+        print(f"  {nombre:<18} memoria={memoria / 1024:.0f} KiB  eliminación ε={tiempo * 1000:.0f} ms  "
+              f"producciones finales={producciones}")
+
+
+if __name__ == "__main__":
+    benchmark_representacion()
@@ -0,0 +1,166 @@
+import io
+from contextlib import redirect_stdout
+from automata import AFN
+from subconjuntos import Subconjuntos
+from minimizacion import MinimizacionAFD
+from eliminador_epsilon import producciones_utiles
+from gramatica_compacta import tokens_de
+
+LINEAL_DERECHA = 'lineal_derecha'
+LINEAL_IZQUIERDA = 'lineal_izquierda'
+GENERAL = 'general'
+
+
+def simbolos_de(gramatica, cuerpo):
+    return () if cuerpo == gramatica.EPSILON else tuple(cuerpo)
+
+
+def clasificar_gramatica(gramatica):
+    """Lineal por la derecha (A → w | w B), por la izquierda (A → w | B w) o general.
+
+    Una gramática con solo cuerpos terminales es ambas cosas y se informa como lineal
+    por la derecha.
+    """
+    derecha = izquierda = True
+    for cuerpos in producciones_utiles(gramatica).values():
+        for cuerpo in cuerpos:
+            posiciones = [i for i, s in enumerate(simbolos_de(gramatica, cuerpo)) if not gramatica.es_terminal(s)]
+            if not posiciones:
+                continue
+            if len(posiciones) > 1:
+                return GENERAL
+            ultimo = len(simbolos_de(gramatica, cuerpo)) - 1
+            derecha = derecha and posiciones[0] == ultimo
+            izquierda = izquierda and posiciones[0] == 0
+            if not derecha and not izquierda:
+                return GENERAL
+    return LINEAL_DERECHA if derecha else LINEAL_IZQUIERDA
+
+
+def _cadena(afn, origen, terminales, destino):
+    """origen --w--> destino con estados intermedios; ε si w es vacía"""
+    if not terminales:
+        afn.agregar_transicion(origen, destino, '#')
+        return
+    for terminal in terminales[:-1]:
+        intermedio = afn.crear_estado()
+        afn.agregar_transicion(origen, intermedio, terminal)
+        origen = intermedio
+    afn.agregar_transicion(origen, destino, terminales[-1])
+
+
+def gramatica_a_afn(gramatica, clasificacion=None):
+    """AFN de una gramática lineal: un estado por no terminal más un estado extra.
+
+    Por la derecha, A → w B es A --w--> B y A → w llega al estado final extra.
+    Por la izquierda, A → B w es B --w--> A, A → w sale del estado inicial extra
+    y el final es el símbolo inicial.
+    """
+    clasificacion = clasificacion or clasificar_gramatica(gramatica)
+    if clasificacion == GENERAL:
+        raise ValueError("La gramática no es lineal: no se puede convertir a AFN")
+
+    utiles = producciones_utiles(gramatica)
+    afn = AFN()
+    estados = {nt: afn.crear_estado() for nt in utiles}
+    if gramatica.simbolo_inicial not in estados:
+        estados[gramatica.simbolo_inicial] = afn.crear_estado()
+    extra = afn.crear_estado()
+
+    for nt, cuerpos in utiles.items():
+        for cuerpo in cuerpos:
+            simbolos = simbolos_de(gramatica, cuerpo)
+            if clasificacion == LINEAL_DERECHA:
+                if simbolos and not gramatica.es_terminal(simbolos[-1]):
+                    _cadena(afn, estados[nt], simbolos[:-1], estados[simbolos[-1]])
+                else:
+                    _cadena(afn, estados[nt], simbolos, extra)
+            else:
+                if simbolos and not gramatica.es_terminal(simbolos[0]):
+                    _cadena(afn, estados[simbolos[0]], simbolos[1:], estados[nt])
+                else:
+                    _cadena(afn, extra, simbolos, estados[nt])
+
+    if clasificacion == LINEAL_DERECHA:
+        afn.start_state = estados[gramatica.simbolo_inicial]
+        final = extra
+    else:
+        afn.start_state = extra
+        final = estados[gramatica.simbolo_inicial]
+    final.is_final = True
+    afn.final_states.add(final)
+    return afn
+
+
+class ReconocedorGramatica:
+    """Pertenencia de cadenas: AFD mínimo si la gramática es lineal, Earley en otro caso"""
+
+    def __init__(self, gramatica):
+        self.gramatica = gramatica
+        self.clasificacion = clasificar_gramatica(gramatica)
+        self.afd = None
+        self.earley = None
+
+        if self.clasificacion != GENERAL:
+            # Subconjuntos y la minimización narran cada paso; aquí solo interesa el resultado
+            with redirect_stdout(io.StringIO()):
+                afn = gramatica_a_afn(gramatica, self.clasificacion)
+                self.afd = MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+        else:
+            from earley import ReconocedorEarley
+            self.earley = ReconocedorEarley(gramatica)
+
+    def reporte(self):
+        print(f"Clasificación: {self.clasificacion}")
+        if self.afd is not None:
+            print(f"  AFD mínimo: {len(self.afd.states)} estados, {len(self.afd.transitions)} transiciones")
+        else:
+            print("  No es lineal: se usa el reconocedor de Earley")
+
+    def pertenece(self, entrada):
+        if self.earley is not None:
+            return self.earley.reconocer(entrada)
+
+        transiciones = self.afd.transitions
+        estado = self.afd.start_state
+        for simbolo in tokens_de(self.gramatica, entrada):
+            estado = transiciones.get((estado, simbolo))
+            if estado is None:
+                return False
+        return estado in self.afd.final_states
+
+
+def benchmark_gramatica_regular(longitudes=(1000, 10000, 100000)):
+    """Compara el AFD de una gramática lineal con Earley sobre la misma gramática"""
+    import time
+    from eliminador_epsilon import crear_gramatica
+    from earley import ReconocedorEarley
+
+    # (a|b)*abb por la derecha y por la izquierda, y una gramática no lineal
+    derecha = crear_gramatica([('S', 'aS'), ('S', 'bS'), ('S', 'abbF'), ('F', 'ε')])
+    izquierda = crear_gramatica([('S', 'Tabb'), ('T', 'Ta'), ('T', 'Tb'), ('T', 'ε')])
+    general = crear_gramatica([('S', 'aSb'), ('S', 'ε')])
+
+    print("=== GRAMÁTICAS REGULARES ===")
+    for nombre, gramatica in (("derecha", derecha), ("izquierda", izquierda), ("anidada", general)):
+        print(f"\n{nombre}:")
+        ReconocedorGramatica(gramatica).reporte()
+
+    for nombre, gramatica in (("derecha", derecha), ("izquierda", izquierda)):
+        reconocedor = ReconocedorGramatica(gramatica)
+        earley = ReconocedorEarley(gramatica)
+        for n in longitudes:
+            entrada = 'ab' * (n // 2) + 'abb'
+            inicio = time.perf_counter()
+            acepta = reconocedor.pertenece(entrada)
+            tiempo_afd = time.perf_counter() - inicio
+
+            inicio = time.perf_counter()
+            acepta_earley = earley.reconocer(entrada)
+            tiempo_earley = time.perf_counter() - inicio
+            print(f"  {nombre:<9} n={len(entrada):<7} AFD={acepta} {tiempo_afd * 1000:.1f} ms  "
+                  f"Earley={acepta_earley} {tiempo_earley * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    benchmark_gramatica_regular()
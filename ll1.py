@@ -0,0 +1,217 @@
+from eliminador_epsilon import calcular_anulables, producciones_utiles
+from gramatica_compacta import tokens_de
+
+FIN = '$'
+
+
+class AnalizadorLL1:
+    """Conjuntos FIRST/FOLLOW por lista de trabajo y tabla predictiva LL(1).
+
+    Los conjuntos son bitsets (int) sobre los terminales, con FIN como un terminal
+    más. La tabla es una lista densa indexada por nt * num_terminales + terminal
+    que guarda el índice de la producción o -1.
+    """
+
+    def __init__(self, gramatica):
+        self.gramatica = gramatica
+        g = gramatica
+        self.anulables = calcular_anulables(g)
+
+        utiles = producciones_utiles(g)
+        # El inicial sin producciones útiles queda como no terminal con su fila vacía
+        self.no_terminales = list(utiles) + ([g.simbolo_inicial] if g.simbolo_inicial not in utiles else [])
+        self.id_nt = {nt: i for i, nt in enumerate(self.no_terminales)}
+
+        # Producciones numeradas con cuerpos como tuplas (ε = tupla vacía)
+        self.producciones = []
+        for nt, cuerpos in utiles.items():
+            for cuerpo in cuerpos:
+                self.producciones.append((nt, () if cuerpo == g.EPSILON else tuple(cuerpo)))
+
+        self.terminales = [FIN]
+        self.id_t = {FIN: 0}
+        for _, cuerpo in self.producciones:
+            for simbolo in cuerpo:
+                if g.es_terminal(simbolo) and simbolo not in self.id_t:
+                    self.id_t[simbolo] = len(self.terminales)
+                    self.terminales.append(simbolo)
+
+        self.first = self.calcular_first()
+        self.follow = self.calcular_follow()
+        self.tabla, self.conflictos = self.construir_tabla()
+
+    def propagar(self, conjuntos, dependientes):
+        """Cierra conjuntos[b] ⊇ conjuntos[a] para cada arista a → b; cada cambio reencola b"""
+        pendientes = [a for a in range(len(conjuntos)) if conjuntos[a]]
+        en_cola = set(pendientes)
+        while pendientes:
+            a = pendientes.pop()
+            en_cola.discard(a)
+            for b in dependientes[a]:
+                unidos = conjuntos[b] | conjuntos[a]
+                if unidos != conjuntos[b]:
+                    conjuntos[b] = unidos
+                    if b not in en_cola:
+                        en_cola.add(b)
+                        pendientes.append(b)
+        return conjuntos
+
+    def calcular_first(self):
+        first = [0] * len(self.no_terminales)
+        dependientes = [[] for _ in self.no_terminales]
+        for nt, cuerpo in self.producciones:
+            a = self.id_nt[nt]
+            for simbolo in cuerpo:
+                if simbolo in self.id_nt:
+                    dependientes[self.id_nt[simbolo]].append(a)
+                    if simbolo in self.anulables:
+                        continue
+                else:
+                    first[a] |= 1 << self.id_t[simbolo]
+                break
+        return self.propagar(first, dependientes)
+
+    def first_de_secuencia(self, simbolos):
+        """(bitset FIRST, es_anulable) de una secuencia de símbolos"""
+        resultado = 0
+        for simbolo in simbolos:
+            if simbolo in self.id_nt:
+                resultado |= self.first[self.id_nt[simbolo]]
+                if simbolo not in self.anulables:
+                    return resultado, False
+            else:
+                return resultado | 1 << self.id_t[simbolo], False
+        return resultado, True
+
+    def calcular_follow(self):
+        follow = [0] * len(self.no_terminales)
+        dependientes = [[] for _ in self.no_terminales]
+        follow[self.id_nt[self.gramatica.simbolo_inicial]] |= 1 << self.id_t[FIN]
+
+        for nt, cuerpo in self.producciones:
+            a = self.id_nt[nt]
+            # Recorrido de derecha a izquierda acumulando FIRST del sufijo: lineal en el cuerpo
+            sufijo = 0
+            sufijo_anulable = True
+            for simbolo in reversed(cuerpo):
+                if simbolo in self.id_nt:
+                    b = self.id_nt[simbolo]
+                    follow[b] |= sufijo
+                    if sufijo_anulable:
+                        dependientes[a].append(b)
+                    if simbolo in self.anulables:
+                        sufijo |= self.first[b]
+                    else:
+                        sufijo = self.first[b]
+                        sufijo_anulable = False
+                else:
+                    sufijo = 1 << self.id_t[simbolo]
+                    sufijo_anulable = False
+        return self.propagar(follow, dependientes)
+
+    def construir_tabla(self):
+        ancho = len(self.terminales)
+        tabla = [-1] * (len(self.no_terminales) * ancho)
+        conflictos = []
+        for indice, (nt, cuerpo) in enumerate(self.producciones):
+            a = self.id_nt[nt]
+            predictores, anulable = self.first_de_secuencia(cuerpo)
+            if anulable:
+                predictores |= self.follow[a]
+            t = 0
+            while predictores:
+                if predictores & 1:
+                    celda = a * ancho + t
+                    if tabla[celda] != -1 and tabla[celda] != indice:
+                        conflictos.append((nt, self.terminales[t], tabla[celda], indice))
+                    else:
+                        tabla[celda] = indice
+                predictores >>= 1
+                t += 1
+        return tabla, conflictos
+
+    def es_ll1(self):
+        return not self.conflictos
+
+    def nombres(self, bitset):
+        return sorted(str(self.gramatica.nombre(t)) if t != FIN else FIN
+                      for i, t in enumerate(self.terminales) if bitset >> i & 1)
+
+    def mostrar(self):
+        g = self.gramatica
+        print("\n=== FIRST / FOLLOW ===")
+        for i, nt in enumerate(self.no_terminales):
+            print(f"  {g.nombre(nt)}: FIRST={self.nombres(self.first[i])} FOLLOW={self.nombres(self.follow[i])}")
+        if self.conflictos:
+            print(f"Conflictos LL(1): {len(self.conflictos)}")
+            for nt, terminal, p1, p2 in self.conflictos:
+                print(f"  [{g.nombre(nt)}, {terminal if terminal == FIN else g.nombre(terminal)}]: "
+                      f"producciones {p1} y {p2}")
+        else:
+            print("La gramática es LL(1)")
+
+    def analizar(self, entrada):
+        """Análisis predictivo con pila explícita; devuelve True si la entrada pertenece"""
+        if self.conflictos:
+            raise ValueError("La gramática no es LL(1): revise conflictos")
+
+        ancho = len(self.terminales)
+        id_t = self.id_t
+        id_nt = self.id_nt
+        tabla = self.tabla
+        producciones = self.producciones
+
+        tokens = tokens_de(self.gramatica, entrada)
+        tokens.append(FIN)
+        pila = [FIN, self.gramatica.simbolo_inicial]
+        posicion = 0
+
+        while pila:
+            cima = pila.pop()
+            token = tokens[posicion]
+            if cima in id_nt:
+                t = id_t.get(token)
+                indice = -1 if t is None else tabla[id_nt[cima] * ancho + t]
+                if indice == -1:
+                    return False
+                pila.extend(reversed(producciones[indice][1]))
+            elif cima == token:
+                posicion += 1
+            else:
+                return False
+
+        return posicion == len(tokens)
+
+
+def benchmark_ll1(longitudes=(1000, 10000, 100000), limite_earley=100000):
+    """Compara el análisis LL(1) con Earley sobre la gramática de expresiones factorizada"""
+    import time
+    from eliminador_epsilon import crear_gramatica
+    from earley import ReconocedorEarley
+
+    gramatica = crear_gramatica([('E', 'TX'), ('X', '+TX'), ('X', 'ε'), ('T', 'FY'), ('Y', '*FY'), ('Y', 'ε'),
+                                 ('F', '(E)'), ('F', 'x')])
+
+    analizador = AnalizadorLL1(gramatica)
+    analizador.mostrar()
+    earley = ReconocedorEarley(gramatica)
+
+    print("\n=== BENCHMARK LL(1) ===")
+    for n in longitudes:
+        entrada = ('(x*x)+' * (n // 6)) + 'x'
+        inicio = time.perf_counter()
+        acepta = analizador.analizar(entrada)
+        tiempo_ll1 = time.perf_counter() - inicio
+
+        linea = f"  n={len(entrada):<7} LL(1)={acepta} {tiempo_ll1 * 1000:.1f} ms"
+        if n <= limite_earley:
+            inicio = time.perf_counter()
+            acepta_earley = earley.reconocer(entrada)
+            linea += f"  Earley={acepta_earley} {(time.perf_counter() - inicio) * 1000:.1f} ms"
+        print(linea)
+
+    AnalizadorLL1(crear_gramatica([('E', 'E+T'), ('E', 'T'), ('T', 'x')])).mostrar()
+
+
+if __name__ == "__main__":
+    benchmark_ll1()
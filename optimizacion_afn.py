@@ -0,0 +1,254 @@
+import time
+from collections import defaultdict
+from automata import AFN, Estado
+
+
+def contar_aristas(afn):
+    return sum(len(destinos) for simbolos in afn.transitions.values() for destinos in simbolos.values())
+
+
+def construir_afn(estados, aristas, inicio, finales):
+    """Crea un AFN nuevo con los estados dados, conservando sus ids"""
+    afn = AFN()
+    mapa = {}
+    for estado in estados:
+        nuevo = Estado(estado.id)
+        nuevo.is_final = estado in finales
+        mapa[estado] = nuevo
+        afn.states.add(nuevo)
+        if nuevo.is_final:
+            afn.final_states.add(nuevo)
+
+    for origen, simbolo, destino in aristas:
+        if origen in mapa and destino in mapa:
+            afn.agregar_transicion(mapa[origen], mapa[destino], simbolo)
+
+    afn.start_state = mapa.get(inicio)
+    afn.state_counter = max((estado.id for estado in estados), default=-1) + 1
+    return afn
+
+
+def aristas_de(afn):
+    for origen, simbolos in afn.transitions.items():
+        for simbolo, destinos in simbolos.items():
+            for destino in destinos:
+                yield origen, simbolo, destino
+
+
+class OptimizadorAFN:
+    PASOS = ['inalcanzables', 'no_coalcanzables', 'fusionar_epsilon', 'eliminar_epsilon']
+
+    def __init__(self, afn):
+        if afn.transiciones_contador:
+            raise ValueError("AFN con contadores: las pasadas de optimización no los soportan")
+        self.afn = afn
+        self.reporte = []
+
+    def optimizar(self, pasos=None):
+        """Aplica las pasadas indicadas (por defecto todas) y devuelve el AFN resultante"""
+        pasos = self.PASOS if pasos is None else pasos
+        afn = self.afn
+
+        for paso in pasos:
+            if paso not in self.PASOS:
+                raise ValueError(f"Pasada desconocida: '{paso}'")
+
+            estados_antes = len(afn.states)
+            aristas_antes = contar_aristas(afn)
+            inicio = time.perf_counter()
+
+            afn = getattr(self, paso)(afn)
+
+            self.reporte.append({
+                'paso': paso,
+                'estados_eliminados': estados_antes - len(afn.states),
+                'aristas_eliminadas': aristas_antes - contar_aristas(afn),
+                'tiempo': time.perf_counter() - inicio,
+            })
+
+        self.mostrar_reporte()
+        return afn
+
+    def mostrar_reporte(self):
+        print("\n=== OPTIMIZACIÓN AFN ===")
+        for fila in self.reporte:
+            print(f"  {fila['paso']:<18} estados -{fila['estados_eliminados']:<6} "
+                  f"aristas -{fila['aristas_eliminadas']:<6} {fila['tiempo'] * 1000:.2f} ms")
+
+    def inalcanzables(self, afn):
+        """Elimina los estados que no se alcanzan desde el estado inicial"""
+        if afn.start_state is None:
+            return afn
+
+        alcanzables = {afn.start_state}
+        stack = [afn.start_state]
+        while stack:
+            estado = stack.pop()
+            for destinos in afn.transitions.get(estado, {}).values():
+                for destino in destinos:
+                    if destino not in alcanzables:
+                        alcanzables.add(destino)
+                        stack.append(destino)
+
+        return construir_afn(alcanzables, aristas_de(afn), afn.start_state, afn.final_states)
+
+    def no_coalcanzables(self, afn):
+        """Elimina los estados desde los que no se llega a ningún estado final"""
+        inversas = defaultdict(set)
+        for origen, _, destino in aristas_de(afn):
+            inversas[destino].add(origen)
+
+        utiles = set(afn.final_states)
+        stack = list(afn.final_states)
+        while stack:
+            estado = stack.pop()
+            for origen in inversas[estado]:
+                if origen not in utiles:
+                    utiles.add(origen)
+                    stack.append(origen)
+
+        # El estado inicial se conserva aunque el lenguaje sea vacío
+        if afn.start_state is not None:
+            utiles.add(afn.start_state)
+
+        return construir_afn(utiles, aristas_de(afn), afn.start_state, afn.final_states)
+
+    def fusionar_epsilon(self, afn):
+        """Colapsa ciclos ε (componentes fuertemente conexas) y cadenas de estados solo-ε"""
+        representante = {}
+        for componente in self.componentes_epsilon(afn):
+            raiz = min(componente, key=lambda e: e.id)
+            for estado in componente:
+                representante[estado] = raiz
+
+        finales = {representante[e] for e in afn.final_states}
+        aristas = set()
+        for origen, simbolo, destino in aristas_de(afn):
+            origen, destino = representante[origen], representante[destino]
+            if not (simbolo == '#' and origen == destino):
+                aristas.add((origen, simbolo, destino))
+
+        # Un estado cuya única salida es ε→t equivale a t (si no es final o t también lo es)
+        salidas = defaultdict(list)
+        for arista in aristas:
+            salidas[arista[0]].append(arista)
+
+        reemplazo = {}
+        for estado, propias in salidas.items():
+            if len(propias) == 1 and propias[0][1] == '#':
+                destino = propias[0][2]
+                if estado not in finales or destino in finales:
+                    reemplazo[estado] = destino
+
+        def resolver(estado):
+            visitados = []
+            while estado in reemplazo:
+                visitados.append(estado)
+                estado = reemplazo[estado]
+            for intermedio in visitados:
+                reemplazo[intermedio] = estado
+            return estado
+
+        estados = {resolver(representante[e]) for e in afn.states}
+        aristas = {(resolver(o), s, resolver(d)) for o, s, d in aristas if o not in reemplazo}
+        aristas = {(o, s, d) for o, s, d in aristas if not (s == '#' and o == d)}
+        inicio = resolver(representante[afn.start_state]) if afn.start_state is not None else None
+
+        return construir_afn(estados, aristas, inicio, finales)
+
+    def componentes_epsilon(self, afn):
+        """Tarjan iterativo sobre el subgrafo de transiciones ε"""
+        indice = {}
+        bajo = {}
+        en_pila = set()
+        pila = []
+        componentes = []
+        contador = 0
+
+        for raiz in afn.states:
+            if raiz in indice:
+                continue
+
+            trabajo = [(raiz, iter(afn.transitions.get(raiz, {}).get('#', ())))]
+            indice[raiz] = bajo[raiz] = contador
+            contador += 1
+            pila.append(raiz)
+            en_pila.add(raiz)
+
+            while trabajo:
+                estado, sucesores = trabajo[-1]
+                avanzo = False
+                for siguiente in sucesores:
+                    if siguiente not in indice:
+                        indice[siguiente] = bajo[siguiente] = contador
+                        contador += 1
+                        pila.append(siguiente)
+                        en_pila.add(siguiente)
+                        trabajo.append((siguiente, iter(afn.transitions.get(siguiente, {}).get('#', ()))))
+                        avanzo = True
+                        break
+                    if siguiente in en_pila:
+                        bajo[estado] = min(bajo[estado], indice[siguiente])
+                if avanzo:
+                    continue
+
+                trabajo.pop()
+                if trabajo:
+                    padre = trabajo[-1][0]
+                    bajo[padre] = min(bajo[padre], bajo[estado])
+
+                if bajo[estado] == indice[estado]:
+                    componente = set()
+                    while True:
+                        miembro = pila.pop()
+                        en_pila.discard(miembro)
+                        componente.add(miembro)
+                        if miembro == estado:
+                            break
+                    componentes.append(componente)
+
+        return componentes
+
+    def eliminar_epsilon(self, afn):
+        """Produce un AFN equivalente sin transiciones ε"""
+        aristas = set()
+        finales = set()
+        for estado in afn.states:
+            clausura = afn.epsilon_closure({estado})
+            if clausura & afn.final_states:
+                finales.add(estado)
+            for intermedio in clausura:
+                for simbolo, destinos in afn.transitions.get(intermedio, {}).items():
+                    if simbolo != '#':
+                        for destino in destinos:
+                            aristas.add((estado, simbolo, destino))
+
+        sin_epsilon = construir_afn(afn.states, aristas, afn.start_state, finales)
+        # Los estados a los que solo se llegaba por ε quedan inalcanzables
+        return self.inalcanzables(sin_epsilon)
+
+
+def test_optimizacion():
+    """Compara la determinización con y sin las pasadas de optimización"""
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+
+    for regex in ["(a|b)*abb(a|b)*", "(a*|b*)+((ε|a)|b*)*", r"if\((a|x|t)+\)\{y\}(else\{n\})?"]:
+        afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+        optimizado = OptimizadorAFN(afn).optimizar()
+
+        inicio = time.perf_counter()
+        Subconjuntos(afn).convertir()
+        tiempo_original = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        Subconjuntos(optimizado).convertir()
+        tiempo_optimizado = time.perf_counter() - inicio
+
+        print(f"\n{regex}: {len(afn.states)} -> {len(optimizado.states)} estados")
+        print(f"  Subconjuntos: {tiempo_original * 1000:.2f} ms -> {tiempo_optimizado * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    test_optimizacion()
@@ -0,0 +1,176 @@
+import io
+from contextlib import redirect_stdout
+from thompson import PATRON_GRUPO, PATRON_REPETICION, parsear_repeticion, tokenizar_postfix
+
+
+def prefijo_comun(a, b):
+    i = 0
+    while i < min(len(a), len(b)) and a[i] == b[i]:
+        i += 1
+    return a[:i]
+
+
+def sufijo_comun(a, b):
+    return prefijo_comun(a[::-1], b[::-1])[::-1]
+
+
+def subcadena_comun(a, b):
+    """Subcadena común más larga (los literales son cortos: búsqueda directa)"""
+    mejor = ''
+    for i in range(len(a)):
+        for j in range(i + len(mejor) + 1, len(a) + 1):
+            if a[i:j] in b:
+                mejor = a[i:j]
+            else:
+                break
+    return mejor
+
+
+def mas_largo(*literales):
+    return max(literales, key=len)
+
+
+def analizar_literales(postfix):
+    """Literales obligatorios de una expresión postfix.
+
+    Devuelve {'exacto', 'prefijo', 'sufijo', 'requerido'}: la única cadena aceptada
+    (o None), un prefijo y un sufijo de toda coincidencia, y una subcadena contenida
+    en toda coincidencia. '' significa que no hay restricción.
+    """
+    vacio = {'exacto': '', 'prefijo': '', 'sufijo': '', 'requerido': ''}
+    libre = {'exacto': None, 'prefijo': '', 'sufijo': '', 'requerido': ''}
+    stack = []
+
+    for token in tokenizar_postfix(postfix):
+        if token == '.':
+            b, a = stack.pop(), stack.pop()
+            exacto = a['exacto'] + b['exacto'] if a['exacto'] is not None and b['exacto'] is not None else None
+            stack.append({
+                'exacto': exacto,
+                'prefijo': a['exacto'] + b['prefijo'] if a['exacto'] is not None else a['prefijo'],
+                'sufijo': a['sufijo'] + b['exacto'] if b['exacto'] is not None else b['sufijo'],
+                'requerido': mas_largo(exacto or '', a['requerido'], b['requerido'], a['sufijo'] + b['prefijo']),
+            })
+        elif token == '|':
+            b, a = stack.pop(), stack.pop()
+            prefijo = prefijo_comun(a['prefijo'], b['prefijo'])
+            sufijo = sufijo_comun(a['sufijo'], b['sufijo'])
+            stack.append({
+                'exacto': a['exacto'] if a['exacto'] == b['exacto'] else None,
+                'prefijo': prefijo,
+                'sufijo': sufijo,
+                'requerido': mas_largo(subcadena_comun(a['requerido'], b['requerido']), prefijo, sufijo),
+            })
+        elif token in ('*', '?'):
+            stack.pop()
+            stack.append(dict(libre))
+        elif token == '+':
+            a = stack.pop()
+            stack.append(dict(a, exacto='' if a['exacto'] == '' else None))
+        elif PATRON_REPETICION.fullmatch(token):
+            a = stack.pop()
+            minimo, maximo = parsear_repeticion(token)
+            if minimo == 0:
+                stack.append(dict(libre))
+            elif a['exacto'] is not None:
+                repetido = a['exacto'] * minimo
+                stack.append({'exacto': repetido if maximo == minimo else None,
+                              'prefijo': repetido, 'sufijo': repetido, 'requerido': repetido})
+            else:
+                stack.append(dict(a))
+        elif PATRON_GRUPO.fullmatch(token):
+            pass  # los grupos no cambian el lenguaje
+        elif token == '#':
+            stack.append(dict(vacio))
+        else:
+            literal = token[1] if token.startswith('\\') and len(token) == 2 else token
+            stack.append({'exacto': literal, 'prefijo': literal, 'sufijo': literal, 'requerido': literal})
+
+    return stack[0] if stack else dict(vacio)
+
+
+class Prefiltro:
+    """Descarta entradas con str.find/startswith antes de correr el autómata"""
+
+    def __init__(self, postfix):
+        self.literales = analizar_literales(postfix)
+        self.prefijo = self.literales['prefijo']
+        self.sufijo = self.literales['sufijo']
+        self.requerido = self.literales['requerido']
+        self.evaluadas = 0
+        self.rechazadas = 0
+
+    @classmethod
+    def desde_regex(cls, regex):
+        from preprocesamiento import infix_to_postfix
+        with redirect_stdout(io.StringIO()):
+            return cls(infix_to_postfix(regex))
+
+    def descarta(self, cadena):
+        """True si la cadena completa no puede coincidir (para coincidencia anclada)"""
+        self.evaluadas += 1
+        if (not cadena.startswith(self.prefijo) or not cadena.endswith(self.sufijo)
+                or cadena.find(self.requerido) < 0):
+            self.rechazadas += 1
+            return True
+        return False
+
+    def descarta_busqueda(self, cadena):
+        """True si ninguna subcadena puede coincidir (para búsqueda)"""
+        self.evaluadas += 1
+        if cadena.find(self.requerido) < 0:
+            self.rechazadas += 1
+            return True
+        return False
+
+    def siguiente_candidato(self, cadena, desde):
+        """Primer desplazamiento >= desde donde puede empezar una coincidencia, o -1"""
+        return cadena.find(self.prefijo, desde)
+
+    def reporte(self):
+        tasa = self.rechazadas / self.evaluadas if self.evaluadas else 0
+        print(f"Prefiltro: prefijo={self.prefijo!r} sufijo={self.sufijo!r} requerido={self.requerido!r}")
+        print(f"  Entradas rechazadas sin autómata: {self.rechazadas}/{self.evaluadas} ({tasa:.0%})")
+
+
+def benchmark_prefiltro(cantidad=5000, longitud=40, semilla=0):
+    """Entradas aleatorias contra los patrones de prueba, con y sin prefiltro"""
+    import random
+    import time
+    from capturas import MaquinaPike, compilar_con_capturas
+
+    generador = random.Random(semilla)
+    patrones = [
+        ("(a|b)*abb(a|b)*", "ab"),
+        (r"if\((a|x|t)+\)\{y\}(else\{n\})?", "if(atx){y}nelse"),
+    ]
+
+    print("=== BENCHMARK PREFILTRO ===")
+    for regex, alfabeto in patrones:
+        entradas = [''.join(generador.choice(alfabeto) for _ in range(generador.randint(1, longitud)))
+                    for _ in range(cantidad)]
+        # Algunas coincidencias reales para que el autómata también trabaje
+        entradas[::50] = ["if(at){y}else{n}" if regex.startswith("if") else "aabba"] * len(entradas[::50])
+
+        afn = compilar_con_capturas(regex)
+        prefiltro = Prefiltro.desde_regex(regex)
+        sin_filtro = MaquinaPike(afn)
+        con_filtro = MaquinaPike(afn, prefiltro)
+
+        for modo, operacion in (("coincidir", "coincidir"), ("buscar", "buscar")):
+            inicio = time.perf_counter()
+            esperado = [getattr(sin_filtro, operacion)(e, grupos=False) for e in entradas]
+            tiempo_sin = time.perf_counter() - inicio
+
+            prefiltro.evaluadas = prefiltro.rechazadas = 0
+            inicio = time.perf_counter()
+            obtenido = [getattr(con_filtro, operacion)(e, grupos=False) for e in entradas]
+            tiempo_con = time.perf_counter() - inicio
+
+            print(f"\n{regex} ({modo}): {tiempo_sin * 1000:.0f} ms -> {tiempo_con * 1000:.0f} ms, "
+                  f"mismos resultados: {esperado == obtenido}")
+            prefiltro.reporte()
+
+
+if __name__ == "__main__":
+    benchmark_prefiltro()
@@ -1,5 +1,5 @@
 import re
-from thompson import Thompson
+from thompson import Thompson, PATRON_REPETICION
 
 PRECEDENCE = {
     '|': 1,  # Unión (más baja precedencia)
@@ -7,9 +7,15 @@ PRECEDENCE = {
     '?': 3,  # Cero o uno
     '*': 3,  # Cero o más
     '+': 3,  # Uno o más
+    '{': 3,  # Repetición acotada {m}, {m,}, {m,n}
 }
 
 
+def es_repeticion(regex, i):
+    """Indica si en la posición i empieza un cuantificador {m}, {m,} o {m,n}"""
+    return regex[i] == '{' and PATRON_REPETICION.match(regex, i) is not None
+
+
 def preprocess_regex(regex):
     """Preprocesa la expresión regular para manejar casos especiales"""
     if not regex:
@@ -42,10 +48,19 @@ def format_regex(regex):
             if i < n:
                 next_c = regex[i]
                 # tras un token 'escapado', concatena si sigue un átomo
-                if next_c not in ['|', ')', '*', '+', '?']:
+                if next_c not in ['|', ')', '*', '+', '?'] and not es_repeticion(regex, i):
                     formatted.append('.')
             continue
 
+        # Cuantificador {m,n}: se copia completo y actúa como operador postfix
+        if es_repeticion(regex, i):
+            repeticion = PATRON_REPETICION.match(regex, i)
+            formatted.append(repeticion.group(0))
+            i = repeticion.end()
+            if i < n and regex[i] not in ['|', ')', '*', '+', '?'] and not es_repeticion(regex, i):
+                formatted.append('.')
+            continue
+
         # 2) Añade el caracter actual
         formatted.append(c)
 
@@ -54,7 +69,8 @@ def format_regex(regex):
             next_c = regex[i + 1]
 
             # el "siguiente es átomo" si es escapado, '(', o símbolo normal
-            next_is_atom = (next_c == '\\') or (next_c not in ['|', ')', '*', '+', '?'])
+            next_is_atom = ((next_c == '\\') or (next_c not in ['|', ')', '*', '+', '?'])) and \
+                not es_repeticion(regex, i + 1)
 
             # el "actual permite concatenar" si es átomo, ')', o un operador postfix
             curr_is_atom = (c not in ['|', '(']) or (c in ['*', '+', '?']) or (c == ')')
@@ -68,10 +84,16 @@ def format_regex(regex):
 
 
 
-def infix_to_postfix(regex):
-    """Convierte expresión regular infix a postfix usando shunting yard"""
+def infix_to_postfix(regex, capturas=False):
+    """Convierte expresión regular infix a postfix usando shunting yard.
+
+    Con capturas=True cada paréntesis es un grupo numerado por su apertura
+    (1, 2, ...) y al cerrarse emite el operador unario (k).
+    """
     output = []
     operator_stack = []
+    grupos_abiertos = []
+    numero_grupo = 0
 
     formatted_re = format_regex(regex)
     print(f"Expresión formateada: {formatted_re}")
@@ -89,20 +111,36 @@ def infix_to_postfix(regex):
             i += 2
             continue
 
+        # Cuantificador {m,n} completo como un solo operador
+        if es_repeticion(formatted_re, i):
+            repeticion = PATRON_REPETICION.match(formatted_re, i).group(0)
+            while (operator_stack and operator_stack[-1] != '(' and
+                   operator_stack[-1][0] in PRECEDENCE and
+                   PRECEDENCE[operator_stack[-1][0]] >= PRECEDENCE['{']):
+                output.append(operator_stack.pop())
+            operator_stack.append(repeticion)
+            i += len(repeticion)
+            continue
+
         if c == '#':  # Epsilon
             output.append(c)
         elif c == '(':
             operator_stack.append(c)
+            numero_grupo += 1
+            grupos_abiertos.append(numero_grupo)
         elif c == ')':
             while operator_stack and operator_stack[-1] != '(':
                 output.append(operator_stack.pop())
             if operator_stack and operator_stack[-1] == '(':
                 operator_stack.pop()  # Remover el '('
-        elif c in PRECEDENCE:
+                grupo = grupos_abiertos.pop()
+                if capturas:
+                    output.append(f"({grupo})")
+        elif c in PRECEDENCE and c != '{':
             # Para operadores, respetar precedencia y asociatividad
             while (operator_stack and operator_stack[-1] != '(' and
-                   operator_stack[-1] in PRECEDENCE and
-                   PRECEDENCE[operator_stack[-1]] >= PRECEDENCE[c]):
+                   operator_stack[-1][0] in PRECEDENCE and
+                   PRECEDENCE[operator_stack[-1][0]] >= PRECEDENCE[c]):
                 output.append(operator_stack.pop())
             operator_stack.append(c)
         else:
@@ -154,6 +192,15 @@ def test_expresiones():
         ("0?(1?)?0*", "0", True),
         ("0?(1?)?0*", "2", False),
 
+        # Repetición acotada
+        ("(0|1|2){1,3}", "20", True),
+        ("(0|1|2){1,3}", "2010", False),
+        ("(a|b){2}c", "abc", True),
+        ("(a|b){2}c", "ac", False),
+        ("a{2,}b", "aaaab", True),
+        ("a{2,}b", "ab", False),
+        (r"\{a{0,2}\}", "{aa}", True),
+
     ]
 
     print("=== PRUEBAS DE EXPRESIONES CORREGIDAS ===")
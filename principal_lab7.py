@@ -1,6 +1,15 @@
 import os
+import sys
+import json
+import time
+import argparse
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from validador_gramaticas import ValidadorGramaticas
-from eliminador_epsilon import EliminadorEpsilon, cargar_gramatica_desde_archivo
+from eliminador_epsilon import EliminadorEpsilon
+from cache_gramaticas import CacheGramaticas
+from gramatica_regular import clasificar_gramatica
 
 
 def main():
@@ -20,9 +29,9 @@ def main():
 
             print(f"\nProcesando: {archivo}")
 
-            print("\n--- VALIDACIÓN DE FORMATO ---")
+            print("\n--- VALIDACIÓN Y CARGA DE GRAMÁTICA ---")
             validador = ValidadorGramaticas()
-            es_valido, errores = validador.validar_archivo(archivo)
+            es_valido, gramatica, errores = validador.cargar_archivo(archivo)
 
             if not es_valido:
                 print("ERROR: Archivo inválido:")
@@ -31,11 +40,9 @@ def main():
                 continue
 
             print("Archivo válido")
+            print(f"Clasificación: {clasificar_gramatica(gramatica)}")
 
             try:
-                print("\n--- CARGA DE GRAMÁTICA ---")
-                gramatica = cargar_gramatica_desde_archivo(archivo)
-
                 print("\n--- ELIMINACIÓN DE PRODUCCIONES-ε ---")
                 eliminador = EliminadorEpsilon(gramatica)
                 resultado = eliminador.eliminar_producciones_epsilon()
@@ -55,5 +62,179 @@ def main():
             print("Opción inválida")
 
 
+# Una caché por proceso y directorio: su contador de escrituras espacia las pasadas de desalojo
+_caches = {}
+
+
+def cache_del_proceso(directorio):
+    cache = _caches.get(directorio)
+    if cache is None:
+        cache = _caches[directorio] = CacheGramaticas(directorio)
+    return cache
+
+
+def procesar_archivo(archivo, umbral_anulables=None, directorio_cache=None):
+    """Valida, carga y elimina producciones-ε de un archivo; nunca lanza excepciones"""
+    resultado = {'archivo': archivo, 'ok': False}
+    inicio = time.perf_counter()
+
+    try:
+        # La salida detallada de cada etapa se descarta en modo por lotes
+        with open(os.devnull, 'w', encoding='utf-8') as nulo, redirect_stdout(nulo):
+            es_valido, gramatica, errores = ValidadorGramaticas().cargar_archivo(archivo)
+            carga = time.perf_counter()
+
+            if not es_valido:
+                resultado['errores'] = errores
+            else:
+                if directorio_cache:
+                    cache = cache_del_proceso(directorio_cache)
+                    final, anulables, acierto = cache.eliminar_producciones_epsilon(gramatica, umbral_anulables)
+                    resultado['cache'] = 'acierto' if acierto else 'fallo'
+                else:
+                    eliminador = EliminadorEpsilon(gramatica, umbral_anulables=umbral_anulables)
+                    final = eliminador.eliminar_producciones_epsilon()
+                    anulables = eliminador.anulables
+                resultado.update({
+                    'ok': True,
+                    'clasificacion': clasificar_gramatica(gramatica),
+                    'simbolo_inicial': final.simbolo_inicial,
+                    'anulables': sorted(anulables),
+                    'producciones': {nt: sorted(cuerpos) for nt, cuerpos in final.producciones.items()},
+                })
+            resultado['tiempos'] = {
+                'validacion_carga': round(carga - inicio, 6),
+                'eliminacion': round(time.perf_counter() - carga, 6),
+            }
+    except Exception as e:
+        resultado['errores'] = [f"{type(e).__name__}: {e}"]
+
+    resultado.setdefault('tiempos', {})['total'] = round(time.perf_counter() - inicio, 6)
+    return resultado
+
+
+def _procesar_con_umbral(argumentos):
+    return procesar_archivo(*argumentos)
+
+
+def expandir_rutas(rutas, patron):
+    """(archivo, ruta relativa) de los archivos dados más los que coinciden con el patrón en directorios.
+
+    La ruta relativa es respecto del directorio dado (o el nombre del archivo si se dio directamente)
+    y da el nombre de salida, para que a/g.txt y b/g.txt no se pisen.
+    """
+    import glob
+
+    archivos = []
+    for ruta in rutas:
+        if os.path.isdir(ruta):
+            for archivo in sorted(glob.glob(os.path.join(ruta, '**', patron), recursive=True)):
+                archivos.append((archivo, os.path.relpath(archivo, ruta)))
+        else:
+            archivos.append((ruta, os.path.basename(ruta)))
+    return archivos
+
+
+def nombres_de_salida(archivos):
+    """archivo -> ruta relativa del .json de salida; las repetidas llevan un hash de la ruta absoluta"""
+    import hashlib
+
+    nombres = {}
+    usados = set()
+    for archivo, relativo in archivos:
+        if archivo in nombres:
+            continue
+        nombre = relativo + '.json'
+        if nombre in usados:
+            sufijo = hashlib.sha1(os.path.abspath(archivo).encode('utf-8')).hexdigest()[:8]
+            nombre = f"{relativo}.{sufijo}.json"
+        usados.add(nombre)
+        nombres[archivo] = nombre
+    return nombres
+
+
+def procesar_en_pool(tareas, procesos=None, chunksize=1):
+    """Resultados en orden. Si un proceso muere, el resto se reintenta en un pool de un proceso,
+    donde el primer futuro que falla identifica al archivo culpable, que queda con su error."""
+    hechos = 0
+    try:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for resultado in pool.map(_procesar_con_umbral, tareas, chunksize=chunksize):
+                hechos += 1
+                yield resultado
+        return
+    except BrokenProcessPool:
+        print(f"Un proceso terminó de forma abrupta; reintentando {len(tareas) - hechos} archivos",
+              file=sys.stderr)
+
+    pendientes = tareas[hechos:]
+    while pendientes:
+        with ProcessPoolExecutor(max_workers=1) as pool:
+            futuros = [pool.submit(_procesar_con_umbral, tarea) for tarea in pendientes]
+            for i, futuro in enumerate(futuros):
+                try:
+                    resultado = futuro.result()
+                except BrokenProcessPool:
+                    yield {'archivo': pendientes[i][0], 'ok': False,
+                           'errores': ["BrokenProcessPool: el proceso terminó de forma abrupta con este archivo"]}
+                    pendientes = pendientes[i + 1:]
+                    break
+                yield resultado
+            else:
+                pendientes = []
+
+
+def main_lotes(argv):
+    parser = argparse.ArgumentParser(
+        description="Procesa gramáticas por lotes: validación, carga y eliminación de producciones-ε")
+    parser.add_argument('rutas', nargs='+', help="archivos o directorios de gramáticas")
+    parser.add_argument('--patron', default='*.txt', help="patrón de archivos dentro de directorios")
+    parser.add_argument('--salida', help="archivo JSON lines de resultados (por defecto, salida estándar)")
+    parser.add_argument('--directorio-salida', help="escribe un <archivo>.json por gramática en este directorio")
+    parser.add_argument('--procesos', type=int, default=None, help="procesos del pool (por defecto, núcleos)")
+    parser.add_argument('--umbral-anulables', type=int, default=None,
+                        help="binariza cuerpos con más anulables que este umbral")
+    parser.add_argument('--cache', help="directorio de caché de gramáticas ya procesadas")
+    args = parser.parse_args(argv)
+
+    archivos = expandir_rutas(args.rutas, args.patron)
+    if not archivos:
+        print("No se encontraron archivos", file=sys.stderr)
+        return 2
+
+    if args.directorio_salida:
+        os.makedirs(args.directorio_salida, exist_ok=True)
+        nombres = nombres_de_salida(archivos)
+
+    salida = open(args.salida, 'w', encoding='utf-8') if args.salida else sys.stdout
+    fallidos = 0
+    inicio = time.perf_counter()
+
+    try:
+        tareas = [(archivo, args.umbral_anulables, args.cache) for archivo, _ in archivos]
+        # Lotes de varios archivos por envío para amortizar la comunicación entre procesos
+        chunksize = max(1, len(tareas) // ((args.procesos or os.cpu_count() or 1) * 4))
+        for resultado in procesar_en_pool(tareas, args.procesos, chunksize):
+            if not resultado['ok']:
+                fallidos += 1
+            linea = json.dumps(resultado, ensure_ascii=False)
+            salida.write(linea + '\n')
+
+            if args.directorio_salida:
+                destino = os.path.join(args.directorio_salida, nombres[resultado['archivo']])
+                os.makedirs(os.path.dirname(destino), exist_ok=True)
+                with open(destino, 'w', encoding='utf-8') as f:
+                    f.write(linea + '\n')
+    finally:
+        if salida is not sys.stdout:
+            salida.close()
+
+    print(f"{len(archivos)} archivos, {fallidos} con errores, {time.perf_counter() - inicio:.2f} s",
+          file=sys.stderr)
+    return 1 if fallidos else 0
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1:
+        sys.exit(main_lotes(sys.argv[1:]))
     main()
@@ -0,0 +1,137 @@
+from collections import deque
+from automata import AFD
+from equivalencia import SUMIDERO, siguiente_estado, reconstruir_cadena
+
+# Aceptación del par (p, q) según la operación
+OPERACIONES = {
+    'interseccion': lambda acepta1, acepta2: acepta1 and acepta2,
+    'union': lambda acepta1, acepta2: acepta1 or acepta2,
+    'diferencia': lambda acepta1, acepta2: acepta1 and not acepta2,
+    'diferencia_simetrica': lambda acepta1, acepta2: acepta1 != acepta2,
+}
+
+
+class ProductoAFD:
+    def __init__(self, afd1, afd2, operacion='interseccion'):
+        if operacion not in OPERACIONES:
+            raise ValueError(f"Operación desconocida: '{operacion}'")
+
+        self.afd1 = afd1
+        self.afd2 = afd2
+        self.operacion = operacion
+        self.acepta = OPERACIONES[operacion]
+        self.alphabet = afd1.alphabet | afd2.alphabet
+
+    def es_muerto(self, p, q):
+        """Indica si desde el par (p, q) ya no se puede aceptar ninguna cadena"""
+        if self.operacion == 'interseccion':
+            return p is SUMIDERO or q is SUMIDERO
+        if self.operacion == 'diferencia':
+            return p is SUMIDERO
+        return p is SUMIDERO and q is SUMIDERO
+
+    def es_aceptacion(self, p, q):
+        return self.acepta(p in self.afd1.final_states, q in self.afd2.final_states)
+
+    def sucesores(self, par):
+        """Pares alcanzables con un símbolo, omitiendo los pares muertos"""
+        p, q = par
+        for simbolo in sorted(self.alphabet):
+            siguiente = (siguiente_estado(self.afd1, p, simbolo), siguiente_estado(self.afd2, q, simbolo))
+            if not self.es_muerto(*siguiente):
+                yield simbolo, siguiente
+
+    def construir(self):
+        """Materializa solo los pares alcanzables desde el par inicial"""
+        afd = AFD()
+        afd.alphabet = set(self.alphabet)
+
+        inicio = (self.afd1.start_state, self.afd2.start_state)
+        nombres = {inicio: "P0"}
+        afd.start_state = "P0"
+        cola = deque([inicio])
+
+        while cola:
+            par = cola.popleft()
+            nombre = nombres[par]
+            afd.states.add(nombre)
+            if self.es_aceptacion(*par):
+                afd.final_states.add(nombre)
+
+            for simbolo, siguiente in self.sucesores(par):
+                if siguiente not in nombres:
+                    nombres[siguiente] = f"P{len(nombres)}"
+                    cola.append(siguiente)
+                afd.transitions[(nombre, simbolo)] = nombres[siguiente]
+
+        print(f"Producto ({self.operacion}) construido: {len(afd.states)} estados, "
+              f"{len(afd.transitions)} transiciones, {len(afd.final_states)} finales")
+        return afd
+
+    def es_vacio(self):
+        """Devuelve (True, None) si el lenguaje es vacío o (False, cadena más corta aceptada)"""
+        inicio = (self.afd1.start_state, self.afd2.start_state)
+        padres = {inicio: None}
+        cola = deque([inicio])
+
+        while cola:
+            par = cola.popleft()
+            if self.es_aceptacion(*par):
+                return False, reconstruir_cadena(padres, par)
+
+            for simbolo, siguiente in self.sucesores(par):
+                if siguiente not in padres:
+                    padres[siguiente] = (par, simbolo)
+                    cola.append(siguiente)
+
+        return True, None
+
+
+def interseccion(afd1, afd2):
+    return ProductoAFD(afd1, afd2, 'interseccion').construir()
+
+
+def union(afd1, afd2):
+    return ProductoAFD(afd1, afd2, 'union').construir()
+
+
+def diferencia(afd1, afd2):
+    return ProductoAFD(afd1, afd2, 'diferencia').construir()
+
+
+def diferencia_simetrica(afd1, afd2):
+    return ProductoAFD(afd1, afd2, 'diferencia_simetrica').construir()
+
+
+def complemento(afd, alfabeto=None):
+    """Complemento de L(afd) sobre el alfabeto declarado (por defecto, el del AFD)"""
+    alfabeto = set(alfabeto) if alfabeto is not None else set(afd.alphabet)
+    if not afd.alphabet <= alfabeto:
+        raise ValueError(f"El alfabeto declarado no contiene a {sorted(afd.alphabet - alfabeto)}")
+
+    resultado = AFD()
+    resultado.alphabet = alfabeto
+    resultado.states = set(afd.states)
+    resultado.start_state = afd.start_state
+    resultado.final_states = afd.states - afd.final_states
+    resultado.transitions = dict(afd.transitions)
+
+    # Completar con un sumidero explícito, que pasa a ser de aceptación
+    sumidero = "S_sumidero"
+    while sumidero in afd.states:
+        sumidero += "'"
+
+    if resultado.start_state is None:
+        resultado.start_state = sumidero
+
+    faltantes = [(estado, simbolo) for estado in resultado.states for simbolo in alfabeto
+                 if (estado, simbolo) not in resultado.transitions]
+    if faltantes or resultado.start_state == sumidero:
+        resultado.states.add(sumidero)
+        resultado.final_states.add(sumidero)
+        for clave in faltantes:
+            resultado.transitions[clave] = sumidero
+        for simbolo in alfabeto:
+            resultado.transitions[(sumidero, simbolo)] = sumidero
+
+    return resultado
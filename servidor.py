@@ -0,0 +1,266 @@
+import io
+import sys
+import json
+import time
+import struct
+import asyncio
+import argparse
+from collections import OrderedDict
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor
+
+# Cada mensaje: longitud (4 bytes, big-endian) + JSON en UTF-8
+CABECERA = struct.Struct('>I')
+MAX_MENSAJE = 16 * 1024 * 1024
+OPERACIONES = ('compile', 'match', 'batch', 'stats')
+
+
+def fuente_para_regex(regex):
+    """Thompson → Subconjuntos → minimización → código fuente; corre en el pool de procesos"""
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+    from minimizacion import MinimizacionAFD
+    from generador_codigo import generar_fuente
+
+    with redirect_stdout(io.StringIO()):
+        afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+        afd = MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+    return generar_fuente(afd), len(afd.states)
+
+
+async def leer_datos(lector):
+    """Cuerpo de un mensaje sin decodificar; un tamaño inválido rompe el encuadre y lanza ValueError"""
+    cabecera = await lector.readexactly(CABECERA.size)
+    (longitud,) = CABECERA.unpack(cabecera)
+    if longitud > MAX_MENSAJE:
+        raise ValueError(f"Mensaje de {longitud} bytes excede el máximo")
+    return await lector.readexactly(longitud)
+
+
+async def leer_mensaje(lector):
+    return json.loads(await leer_datos(lector))
+
+
+def codificar(mensaje):
+    datos = json.dumps(mensaje, ensure_ascii=False).encode('utf-8')
+    return CABECERA.pack(len(datos)) + datos
+
+
+class PoolAutomatas:
+    """Autómatas compilados compartidos entre conexiones, indexados por regex.
+
+    Guarda a lo sumo max_patrones y descarta el de uso menos reciente (LRU).
+    """
+
+    def __init__(self, ejecutor, max_patrones=1024):
+        self.ejecutor = ejecutor
+        self.max_patrones = max_patrones
+        self.funciones = OrderedDict()   # regex -> (función, estados), del menos al más reciente
+        self.en_curso = {}   # regex -> futuro de una compilación pendiente
+        self.aciertos = 0
+        self.compilaciones = 0
+        self.desalojados = 0
+
+    async def obtener(self, regex):
+        """(función coincide, cantidad de estados) del patrón, compilándolo si hace falta"""
+        compilado = self.funciones.get(regex)
+        if compilado is not None:
+            self.funciones.move_to_end(regex)
+            self.aciertos += 1
+            return compilado
+
+        # Peticiones simultáneas del mismo patrón esperan la misma compilación
+        futuro = self.en_curso.get(regex)
+        if futuro is None:
+            futuro = asyncio.ensure_future(self._compilar(regex))
+            self.en_curso[regex] = futuro
+        try:
+            return await asyncio.shield(futuro)
+        finally:
+            if futuro.done():
+                self.en_curso.pop(regex, None)
+
+    async def _compilar(self, regex):
+        loop = asyncio.get_running_loop()
+        fuente, estados = await loop.run_in_executor(self.ejecutor, fuente_para_regex, regex)
+        espacio = {}
+        exec(compile(fuente, "<afd coincide>", 'exec'), espacio)
+        compilado = self.funciones[regex] = (espacio['coincide'], estados)
+        self.compilaciones += 1
+        while len(self.funciones) > self.max_patrones:
+            self.funciones.popitem(last=False)
+            self.desalojados += 1
+        return compilado
+
+
+class ServidorAutomatas:
+    """Servidor asyncio: compile, match, batch y stats sobre mensajes con longitud"""
+
+    def __init__(self, procesos=None, max_patrones=1024):
+        self.ejecutor = ProcessPoolExecutor(max_workers=procesos)
+        self.pool = PoolAutomatas(self.ejecutor, max_patrones)
+        self.peticiones = {}
+        self.conexiones = 0
+        self.inicio = time.monotonic()
+
+    async def atender(self, lector, escritor):
+        """Cada petición de la conexión corre como tarea propia (pipelining); las respuestas llevan su id"""
+        self.conexiones += 1
+        bloqueo = asyncio.Lock()
+        tareas = set()
+        try:
+            while True:
+                try:
+                    datos = await leer_datos(lector)
+                except asyncio.IncompleteReadError:
+                    break
+                tarea = asyncio.ensure_future(self.responder(datos, escritor, bloqueo))
+                tareas.add(tarea)
+                tarea.add_done_callback(tareas.discard)
+            if tareas:
+                await asyncio.gather(*tareas)
+        except (ConnectionError, ValueError) as e:
+            print(f"Conexión cerrada: {e}", file=sys.stderr)
+        finally:
+            self.conexiones -= 1
+            escritor.close()
+
+    async def responder(self, datos, escritor, bloqueo):
+        respuesta = await self.procesar(datos)
+        try:
+            async with bloqueo:
+                escritor.write(codificar(respuesta))
+                await escritor.drain()
+        except ConnectionError as e:
+            print(f"No se pudo responder: {e}", file=sys.stderr)
+
+    async def procesar(self, datos):
+        """Toda petición recibe respuesta: los errores, incluso de JSON o de forma, vuelven con ok=False"""
+        identificador = None
+        try:
+            mensaje = json.loads(datos)
+            if not isinstance(mensaje, dict):
+                raise ValueError(f"Se esperaba un objeto JSON, no {type(mensaje).__name__}")
+            identificador = mensaje.get('id')
+            operacion = mensaje.get('op')
+            respuesta = {'id': identificador, 'ok': True}
+            # Las operaciones inválidas comparten una clave: el cliente no hace crecer las estadísticas
+            clave = operacion if operacion in OPERACIONES else 'desconocida'
+            self.peticiones[clave] = self.peticiones.get(clave, 0) + 1
+
+            if operacion == 'compile':
+                _, respuesta['estados'] = await self.pool.obtener(mensaje['regex'])
+            elif operacion == 'match':
+                coincide, _ = await self.pool.obtener(mensaje['regex'])
+                respuesta['acepta'] = coincide(mensaje['cadena'])
+            elif operacion == 'batch':
+                coincide, _ = await self.pool.obtener(mensaje['regex'])
+                respuesta['resultados'] = [coincide(cadena) for cadena in mensaje['cadenas']]
+            elif operacion == 'stats':
+                respuesta.update({
+                    'patrones': len(self.pool.funciones),
+                    'compilaciones': self.pool.compilaciones,
+                    'desalojados_pool': self.pool.desalojados,
+                    'aciertos_pool': self.pool.aciertos,
+                    'peticiones': self.peticiones,
+                    'conexiones': self.conexiones,
+                    'segundos_activo': round(time.monotonic() - self.inicio, 3),
+                })
+            else:
+                raise ValueError(f"Operación desconocida: '{operacion}'")
+        except Exception as e:
+            respuesta = {'id': identificador, 'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        return respuesta
+
+    async def servir(self, socket_unix=None, host='127.0.0.1', puerto=8765):
+        if socket_unix:
+            servidor = await asyncio.start_unix_server(self.atender, path=socket_unix)
+            print(f"Escuchando en {socket_unix}", file=sys.stderr)
+        else:
+            servidor = await asyncio.start_server(self.atender, host, puerto)
+            print(f"Escuchando en {host}:{puerto}", file=sys.stderr)
+        async with servidor:
+            await servidor.serve_forever()
+
+
+async def abrir_conexion(socket_unix=None, host='127.0.0.1', puerto=8765):
+    if socket_unix:
+        return await asyncio.open_unix_connection(socket_unix)
+    return await asyncio.open_connection(host, puerto)
+
+
+async def generar_carga(peticiones=20000, conexiones=4, en_vuelo=64, socket_unix=None,
+                        host='127.0.0.1', puerto=8765):
+    """Cliente de carga: peticiones match con pipelining; devuelve latencias en segundos"""
+    patrones = ["(a|b)*abb(a|b)*", r"if\((a|x|t)+\)\{y\}(else\{n\})?", "(0|1|2){1,3}"]
+    cadenas = ["aababb", "if(ax){y}else{n}", "120", "abab", "if(){y}"]
+    latencias = []
+
+    async def cliente(numero, cantidad):
+        lector, escritor = await abrir_conexion(socket_unix, host, puerto)
+        enviados = {}
+        ventana = asyncio.Semaphore(en_vuelo)
+
+        async def recibir():
+            for _ in range(cantidad):
+                respuesta = await leer_mensaje(lector)
+                latencias.append(time.perf_counter() - enviados.pop(respuesta['id']))
+                ventana.release()
+
+        receptor = asyncio.ensure_future(recibir())
+        for i in range(cantidad):
+            await ventana.acquire()
+            identificador = f"{numero}-{i}"
+            enviados[identificador] = time.perf_counter()
+            escritor.write(codificar({'id': identificador, 'op': 'match',
+                                      'regex': patrones[i % len(patrones)],
+                                      'cadena': cadenas[i % len(cadenas)]}))
+            await escritor.drain()
+        await receptor
+        escritor.close()
+
+    por_conexion = peticiones // conexiones
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente(n, por_conexion) for n in range(conexiones)))
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    p50 = latencias[len(latencias) // 2]
+    p99 = latencias[min(len(latencias) - 1, int(len(latencias) * 0.99))]
+    print(f"{len(latencias)} peticiones en {total:.2f} s ({len(latencias) / total:.0f}/s), "
+          f"p50={p50 * 1000:.2f} ms  p99={p99 * 1000:.2f} ms")
+
+    lector, escritor = await abrir_conexion(socket_unix, host, puerto)
+    escritor.write(codificar({'id': 'stats', 'op': 'stats'}))
+    print(f"Estadísticas del servidor: {await leer_mensaje(lector)}")
+    escritor.close()
+    return latencias
+
+
+def main(argv):
+    parser = argparse.ArgumentParser(description="Servidor de autómatas y cliente de carga")
+    parser.add_argument('modo', choices=['servir', 'carga'])
+    parser.add_argument('--unix', help="ruta del socket Unix (por defecto, TCP en localhost)")
+    parser.add_argument('--puerto', type=int, default=8765)
+    parser.add_argument('--procesos', type=int, default=None, help="procesos para compilar patrones")
+    parser.add_argument('--max-patrones', type=int, default=1024, help="autómatas compilados en memoria (LRU)")
+    parser.add_argument('--peticiones', type=int, default=20000)
+    parser.add_argument('--conexiones', type=int, default=4)
+    args = parser.parse_args(argv)
+
+    if args.modo == 'servir':
+        servidor = ServidorAutomatas(args.procesos, args.max_patrones)
+        try:
+            asyncio.run(servidor.servir(args.unix, puerto=args.puerto))
+        except KeyboardInterrupt:
+            pass
+        finally:
+            servidor.ejecutor.shutdown()
+    else:
+        asyncio.run(generar_carga(args.peticiones, args.conexiones, socket_unix=args.unix, puerto=args.puerto))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
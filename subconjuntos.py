@@ -9,6 +9,9 @@ class Subconjuntos:
         self.estados_afd = {}  # Mapeo de conjuntos de estados AFN a estados AFD
 
     def convertir(self):
+        if self.afn.transiciones_contador:
+            raise ValueError("AFN con contadores: use simular_contadores o construya sin modo_contador")
+
         # Obtener el alfabeto (excluyendo epsilon)
         alphabet = set()
         for estado in self.afn.transitions:
@@ -0,0 +1,253 @@
+import sys
+import time
+from array import array
+
+
+class TablaComprimida:
+    """Tabla de transiciones de un AFD en vectores base/next/check/default (estilo flex).
+
+    Estados y símbolos son enteros: la columna de un símbolo es ord(símbolo). La fila
+    del estado s ocupa next[base[s] + c] para cada columna c presente, marcada con
+    check[...] == s. default[s] es un estado plantilla: s solo empaqueta las columnas en
+    que difiere de ella (con next == -1 si s no tiene esa transición) y el resto se busca
+    en la plantilla, siguiendo la cadena. default -1 indica que la transición no existe.
+    """
+    # Plantillas candidatas por fila: las últimas filas ya procesadas
+    MAX_CANDIDATAS = 64
+
+    def __init__(self, afd):
+        self.afd = afd
+        estados = sorted(afd.states, key=lambda e: (e != afd.start_state, str(e)))
+        self.nombres = estados
+        self.numeros = {estado: i for i, estado in enumerate(estados)}
+        self.finales = bytearray(estado in afd.final_states for estado in estados)
+        self.inicio = self.numeros.get(afd.start_state, -1)
+
+        filas = [{} for _ in estados]
+        for (origen, simbolo), destino in afd.transitions.items():
+            filas[self.numeros[origen]][ord(simbolo)] = self.numeros[destino]
+
+        self.base = array('i', [0] * len(estados))
+        self.default = array('i', [-1] * len(estados))
+        self.next = array('i')
+        self.check = array('i')
+        self.construir(filas)
+
+    def construir(self, filas):
+        """Elige plantillas, luego empaqueta las diferencias por first-fit, de la más poblada a la menos"""
+        empaquetadas = []
+        procesadas = []
+        # Las filas más pobladas primero: suelen ser las mejores plantillas para las demás
+        for s in sorted(range(len(filas)), key=lambda s: -len(filas[s])):
+            fila = filas[s]
+            mejor, diferencias = -1, fila
+            for t in procesadas[-self.MAX_CANDIDATAS:]:
+                plantilla = filas[t]
+                distintas = {c: d for c, d in fila.items() if plantilla.get(c) != d}
+                distintas.update((c, -1) for c in plantilla if c not in fila)
+                if len(distintas) < len(diferencias):
+                    mejor, diferencias = t, distintas
+            self.default[s] = mejor
+            procesadas.append(s)
+            if diferencias:
+                empaquetadas.append((s, sorted(diferencias.items())))
+
+        empaquetadas.sort(key=lambda t: -len(t[1]))
+        ocupadas = bytearray()
+        primer_libre = 0
+
+        for s, entradas in empaquetadas:
+            minima = entradas[0][0]
+            posicion = primer_libre
+            while True:
+                desplazamiento = posicion - minima
+                if all(desplazamiento + c >= len(ocupadas) or not ocupadas[desplazamiento + c]
+                       for c, _ in entradas):
+                    break
+                posicion += 1
+
+            self.base[s] = desplazamiento
+            ultima = desplazamiento + entradas[-1][0]
+            if ultima >= len(ocupadas):
+                faltan = ultima + 1 - len(ocupadas)
+                ocupadas.extend(bytes(faltan))
+                self.next.extend([-1] * faltan)
+                self.check.extend([-1] * faltan)
+            for c, destino in entradas:
+                ocupadas[desplazamiento + c] = 1
+                self.next[desplazamiento + c] = destino
+                self.check[desplazamiento + c] = s
+
+            while primer_libre < len(ocupadas) and ocupadas[primer_libre]:
+                primer_libre += 1
+
+    def siguiente(self, estado, simbolo):
+        columna = ord(simbolo)
+        while estado >= 0:
+            i = self.base[estado] + columna
+            if 0 <= i < len(self.check) and self.check[i] == estado:
+                return self.next[i]
+            estado = self.default[estado]
+        return -1
+
+    def coincide(self, cadena):
+        estado = self.inicio
+        if estado < 0:
+            return False
+        base, next_, check, default = self.base, self.next, self.check, self.default
+        limite = len(check)
+        for c in cadena:
+            columna = ord(c)
+            actual = estado
+            while True:
+                i = base[actual] + columna
+                if 0 <= i < limite and check[i] == actual:
+                    estado = next_[i]
+                    break
+                actual = default[actual]
+                if actual < 0:
+                    return False
+            if estado < 0:
+                return False
+        return bool(self.finales[estado])
+
+    def bytes_usados(self):
+        return sum(a.itemsize * len(a) for a in (self.base, self.default, self.next, self.check)) + len(self.finales)
+
+
+class TablaDensa:
+    """Tabla estados × columnas (ord del símbolo) completa, como referencia"""
+
+    def __init__(self, afd):
+        estados = sorted(afd.states, key=lambda e: (e != afd.start_state, str(e)))
+        numeros = {estado: i for i, estado in enumerate(estados)}
+        self.columnas = max((ord(s) for s in afd.alphabet), default=-1) + 1
+        self.tabla = array('i', [-1] * (len(estados) * self.columnas))
+        for (origen, simbolo), destino in afd.transitions.items():
+            self.tabla[numeros[origen] * self.columnas + ord(simbolo)] = numeros[destino]
+        self.finales = bytearray(estado in afd.final_states for estado in estados)
+        self.inicio = numeros.get(afd.start_state, -1)
+
+    def coincide(self, cadena):
+        estado = self.inicio
+        if estado < 0:
+            return False
+        tabla, columnas = self.tabla, self.columnas
+        for c in cadena:
+            columna = ord(c)
+            if columna >= columnas:
+                return False
+            estado = tabla[estado * columnas + columna]
+            if estado < 0:
+                return False
+        return bool(self.finales[estado])
+
+    def bytes_usados(self):
+        return self.tabla.itemsize * len(self.tabla) + len(self.finales)
+
+
+def bytes_diccionario(afd):
+    """Memoria del diccionario {(estado, símbolo): estado} con sus tuplas clave"""
+    return sys.getsizeof(afd.transitions) + sum(sys.getsizeof(clave) for clave in afd.transitions)
+
+
+def simular_diccionario(afd, cadena):
+    estado = afd.start_state
+    for c in cadena:
+        estado = afd.transitions.get((estado, c))
+        if estado is None:
+            return False
+    return estado in afd.final_states
+
+
+def benchmark_tabla_comprimida(cantidad=100000, semilla=0):
+    """Compresión y velocidad de búsqueda: diccionario, tabla densa y tabla comprimida"""
+    import io
+    import random
+    from contextlib import redirect_stdout
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+    from minimizacion import MinimizacionAFD
+
+    palabras = ["si", "sino", "mientras", "para", "retornar", "año", "función", "λx", "x→y", "αβγ"]
+    generador = random.Random(semilla)
+    print("=== BENCHMARK TABLA COMPRIMIDA ===")
+
+    for regex in ["|".join(palabras), "(" + "|".join(palabras) + ")+"]:
+        with redirect_stdout(io.StringIO()):
+            afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+            afd = MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+
+        comprimida = TablaComprimida(afd)
+        densa = TablaDensa(afd)
+        entradas = [''.join(generador.choice(palabras) for _ in range(generador.randint(1, 3)))
+                    for _ in range(cantidad)]
+
+        print(f"\n{len(afd.states)} estados, {len(afd.alphabet)} símbolos, "
+              f"{len(afd.transitions)} transiciones, columnas hasta {densa.columnas}")
+        resultados = []
+        for nombre, coincide, memoria in (
+                ("diccionario", lambda e: simular_diccionario(afd, e), bytes_diccionario(afd)),
+                ("densa", densa.coincide, densa.bytes_usados()),
+                ("comprimida", comprimida.coincide, comprimida.bytes_usados())):
+            inicio = time.perf_counter()
+            resultados.append([coincide(e) for e in entradas])
+            tiempo = time.perf_counter() - inicio
+            print(f"  {nombre:<12} {memoria / 1024:>9.1f} KiB  {tiempo * 1000:.0f} ms")
+
+        print(f"  Compresión frente a la densa: {densa.bytes_usados() / comprimida.bytes_usados():.0f}x, "
+              f"next/check de {len(comprimida.next)} entradas; mismos resultados: "
+              f"{resultados[0] == resultados[1] == resultados[2]}")
+
+
+def test_tabla_comprimida(cantidad=300, semilla=1):
+    """Diferencial: tabla comprimida frente a afd.transitions, también con símbolos fuera del alfabeto"""
+    import io
+    import random
+    from contextlib import redirect_stdout
+    from preprocesamiento import infix_to_postfix
+    from thompson import Thompson
+    from subconjuntos import Subconjuntos
+    from minimizacion import MinimizacionAFD
+
+    generador = random.Random(semilla)
+
+    def regex_aleatoria(profundidad):
+        r = generador.random()
+        if profundidad == 0 or r < 0.3:
+            return generador.choice("abcd")
+        if r < 0.55:
+            return regex_aleatoria(profundidad - 1) + regex_aleatoria(profundidad - 1)
+        if r < 0.75:
+            return f"({regex_aleatoria(profundidad - 1)}|{regex_aleatoria(profundidad - 1)})"
+        return f"({regex_aleatoria(profundidad - 1)}){generador.choice('*+?')}"
+
+    print("=== TEST TABLA COMPRIMIDA ===")
+    fallos = 0
+    for _ in range(cantidad):
+        regex = regex_aleatoria(4)
+        with redirect_stdout(io.StringIO()):
+            afn = Thompson().construir_desde_postfix(infix_to_postfix(regex))
+            afd = MinimizacionAFD(Subconjuntos(afn).convertir()).minimizar()
+        tabla = TablaComprimida(afd)
+
+        for estado, numero in tabla.numeros.items():
+            for simbolo in "abcdz":
+                esperado = afd.transitions.get((estado, simbolo))
+                obtenido = tabla.siguiente(numero, simbolo)
+                if obtenido != (-1 if esperado is None else tabla.numeros[esperado]):
+                    fallos += 1
+        for _ in range(50):
+            cadena = ''.join(generador.choice("abcdz") for _ in range(generador.randint(0, 8)))
+            if tabla.coincide(cadena) != simular_diccionario(afd, cadena):
+                fallos += 1
+                print(f"  ❌ {regex} con '{cadena}'")
+
+    print(f"  {cantidad} patrones aleatorios, {fallos} diferencias")
+    return fallos == 0
+
+
+if __name__ == "__main__":
+    test_tabla_comprimida()
+    benchmark_tabla_comprimida()
@@ -1,8 +1,93 @@
+import re
 from automata import AFN
 
+# Repetición acotada: {m}, {m,} o {m,n}
+PATRON_REPETICION = re.compile(r'\{(\d+)(,(\d*))?\}')
+
+# Grupo de captura k en postfix: (k), operador unario (los paréntesis literales van escapados)
+PATRON_GRUPO = re.compile(r'\((\d+)\)')
+
+
+def parsear_repeticion(token):
+    """Devuelve (minimo, maximo) de un token {m}, {m,} o {m,n}; maximo None = sin cota"""
+    coincidencia = PATRON_REPETICION.fullmatch(token)
+    if not coincidencia:
+        raise ValueError(f"Repetición inválida: '{token}'")
+
+    minimo = int(coincidencia.group(1))
+    if coincidencia.group(2) is None:
+        maximo = minimo
+    elif coincidencia.group(3) == '':
+        maximo = None
+    else:
+        maximo = int(coincidencia.group(3))
+
+    if maximo is not None and maximo < minimo:
+        raise ValueError(f"Repetición inválida: '{token}' (máximo menor que mínimo)")
+    return minimo, maximo
+
+
+def tokenizar_postfix(postfix):
+    """Tokens de una expresión postfix: escapados, {m,n} y (k) son un solo token"""
+    tokens = []
+    i = 0
+    while i < len(postfix):
+        repeticion = PATRON_REPETICION.match(postfix, i)
+        if postfix[i] == '\\' and i + 1 < len(postfix):
+            tokens.append(postfix[i:i + 2])
+            i += 2
+        elif repeticion:
+            tokens.append(repeticion.group(0))
+            i = repeticion.end()
+        elif PATRON_GRUPO.match(postfix, i):
+            grupo = PATRON_GRUPO.match(postfix, i)
+            tokens.append(grupo.group(0))
+            i = grupo.end()
+        else:
+            tokens.append(postfix[i])
+            i += 1
+    return tokens
+
+
 class Thompson:
-    def __init__(self):
-        pass
+    def __init__(self, modo_contador=False):
+        # En modo contador las repeticiones {m,n} no se expanden: el operando
+        # se construye una sola vez y un contador controla las iteraciones
+        self.modo_contador = modo_contador
+        self.siguiente_contador = 0
+        self.metricas = {}
+
+    def _copiar_fragmento(self, destino, afn, mantener_finales=False):
+        """Copia estados y transiciones de afn dentro de destino; devuelve el mapeo de estados"""
+        mapa_estados = {}
+        for estado in afn.states:
+            is_final = mantener_finales and estado in afn.final_states
+            mapa_estados[estado] = destino.crear_estado(is_final=is_final)
+
+        for origen in afn.transitions:
+            for simbolo in afn.transitions[origen]:
+                # Las ε se copian en su orden de inserción para conservar la prioridad
+                destinos = afn.orden_epsilon[origen] if simbolo == '#' else afn.transitions[origen][simbolo]
+                for destino_original in destinos:
+                    destino.agregar_transicion(
+                        mapa_estados[origen],
+                        mapa_estados[destino_original],
+                        simbolo
+                    )
+
+        for (origen, destino_original), ranura in afn.etiquetas.items():
+            destino.etiquetas[(mapa_estados[origen], mapa_estados[destino_original])] = ranura
+
+        for origen, operaciones in afn.transiciones_contador.items():
+            for destino_original, accion, contador, minimo, maximo in operaciones:
+                destino.agregar_transicion_contador(
+                    mapa_estados[origen],
+                    mapa_estados[destino_original],
+                    accion, contador, minimo, maximo
+                )
+        destino.num_contadores = max(destino.num_contadores, afn.num_contadores)
+
+        return mapa_estados
 
     def crear_simbolo(self, char):
         """Crear AFN para un símbolo individual"""
@@ -34,39 +119,9 @@ class Thompson:
         nuevo_afn = AFN()
         nuevo_afn.state_counter = max(afn1.state_counter, afn2.state_counter)
 
-        # Mapeo de estados
-        mapa_estados1 = {}
-        mapa_estados2 = {}
-
-        # Copiar estados de AFN1 (ninguno será final)
-        for estado in afn1.states:
-            nuevo_estado = nuevo_afn.crear_estado(is_final=False)
-            mapa_estados1[estado] = nuevo_estado
-
-        # Copiar estados de AFN2 (mantener finalidad)
-        for estado in afn2.states:
-            is_final = estado in afn2.final_states
-            nuevo_estado = nuevo_afn.crear_estado(is_final=is_final)
-            mapa_estados2[estado] = nuevo_estado
-
-        # Copiar transiciones
-        for origen in afn1.transitions:
-            for simbolo in afn1.transitions[origen]:
-                for destino in afn1.transitions[origen][simbolo]:
-                    nuevo_afn.agregar_transicion(
-                        mapa_estados1[origen],
-                        mapa_estados1[destino],
-                        simbolo
-                    )
-
-        for origen in afn2.transitions:
-            for simbolo in afn2.transitions[origen]:
-                for destino in afn2.transitions[origen][simbolo]:
-                    nuevo_afn.agregar_transicion(
-                        mapa_estados2[origen],
-                        mapa_estados2[destino],
-                        simbolo
-                    )
+        # Copiar AFN1 (ningún estado será final) y AFN2 (mantener finalidad)
+        mapa_estados1 = self._copiar_fragmento(nuevo_afn, afn1)
+        mapa_estados2 = self._copiar_fragmento(nuevo_afn, afn2, mantener_finales=True)
 
         # Conectar estados finales de AFN1 con estado inicial de AFN2
         for estado_final in afn1.final_states:
@@ -90,37 +145,9 @@ class Thompson:
         nuevo_inicio = nuevo_afn.crear_estado()
         nuevo_fin = nuevo_afn.crear_estado(is_final=True)
 
-        # Mapeo de estados
-        mapa_estados1 = {}
-        mapa_estados2 = {}
-
         # Copiar estados (ninguno será final)
-        for estado in afn1.states:
-            nuevo_estado = nuevo_afn.crear_estado(is_final=False)
-            mapa_estados1[estado] = nuevo_estado
-
-        for estado in afn2.states:
-            nuevo_estado = nuevo_afn.crear_estado(is_final=False)
-            mapa_estados2[estado] = nuevo_estado
-
-        # Copiar transiciones
-        for origen in afn1.transitions:
-            for simbolo in afn1.transitions[origen]:
-                for destino in afn1.transitions[origen][simbolo]:
-                    nuevo_afn.agregar_transicion(
-                        mapa_estados1[origen],
-                        mapa_estados1[destino],
-                        simbolo
-                    )
-
-        for origen in afn2.transitions:
-            for simbolo in afn2.transitions[origen]:
-                for destino in afn2.transitions[origen][simbolo]:
-                    nuevo_afn.agregar_transicion(
-                        mapa_estados2[origen],
-                        mapa_estados2[destino],
-                        simbolo
-                    )
+        mapa_estados1 = self._copiar_fragmento(nuevo_afn, afn1)
+        mapa_estados2 = self._copiar_fragmento(nuevo_afn, afn2)
 
         # Conectar nuevo inicio con inicios de AFN1 y AFN2
         nuevo_afn.agregar_transicion(nuevo_inicio, mapa_estados1[afn1.start_state], '#')
@@ -144,28 +171,16 @@ class Thompson:
         nuevo_inicio = nuevo_afn.crear_estado()
         nuevo_fin = nuevo_afn.crear_estado(is_final=True)
 
-        # Mapeo de estados
-        mapa_estados = {}
-        for estado in afn.states:
-            nuevo_estado = nuevo_afn.crear_estado(is_final=False)
-            mapa_estados[estado] = nuevo_estado
-
-        # Copiar transiciones
-        for origen in afn.transitions:
-            for simbolo in afn.transitions[origen]:
-                for destino in afn.transitions[origen][simbolo]:
-                    nuevo_afn.agregar_transicion(
-                        mapa_estados[origen],
-                        mapa_estados[destino],
-                        simbolo
-                    )
+        # Copiar estados (ninguno será final)
+        mapa_estados = self._copiar_fragmento(nuevo_afn, afn)
 
         # Transiciones epsilon para Kleene
         nuevo_afn.agregar_transicion(nuevo_inicio, mapa_estados[afn.start_state], '#')
 
+        # Repetir antes que salir: prioridad voraz para la simulación con capturas
         for estado_final in afn.final_states:
-            nuevo_afn.agregar_transicion(mapa_estados[estado_final], nuevo_fin, '#')
             nuevo_afn.agregar_transicion(mapa_estados[estado_final], mapa_estados[afn.start_state], '#')
+            nuevo_afn.agregar_transicion(mapa_estados[estado_final], nuevo_fin, '#')
 
         # Epsilon directo para aceptar cadena vacía
         nuevo_afn.agregar_transicion(nuevo_inicio, nuevo_fin, '#')
@@ -174,14 +189,116 @@ class Thompson:
         return nuevo_afn
 
     def plus(self, afn):
-        """Uno o más: AFN+ = AFN · AFN*"""
-        afn_estrella = self.estrella(afn)
-        return self.concatenacion(afn, afn_estrella)
+        """Uno o más: AFN+ = AFN · AFN*, con una sola copia del operando y ε de regreso"""
+        nuevo_afn = AFN()
+        nuevo_afn.state_counter = afn.state_counter
+
+        nuevo_inicio = nuevo_afn.crear_estado()
+        nuevo_fin = nuevo_afn.crear_estado(is_final=True)
+
+        mapa_estados = self._copiar_fragmento(nuevo_afn, afn)
+
+        nuevo_afn.agregar_transicion(nuevo_inicio, mapa_estados[afn.start_state], '#')
+        # Repetir antes que salir: prioridad voraz para la simulación con capturas
+        for estado_final in afn.final_states:
+            nuevo_afn.agregar_transicion(mapa_estados[estado_final], mapa_estados[afn.start_state], '#')
+            nuevo_afn.agregar_transicion(mapa_estados[estado_final], nuevo_fin, '#')
+
+        nuevo_afn.start_state = nuevo_inicio
+        return nuevo_afn
 
     def opcional(self, afn):
-        """Cero o uno: AFN? = ε | AFN"""
+        """Cero o uno: AFN? = AFN | ε (la alternativa no vacía tiene prioridad)"""
         epsilon = self.crear_epsilon()
-        return self.union(epsilon, afn)
+        return self.union(afn, epsilon)
+
+    def grupo(self, afn, numero):
+        """Grupo de captura: ε etiquetadas con las ranuras 2k (inicio) y 2k+1 (fin)"""
+        nuevo_afn = AFN()
+        nuevo_inicio = nuevo_afn.crear_estado()
+        nuevo_fin = nuevo_afn.crear_estado(is_final=True)
+
+        mapa_estados = self._copiar_fragmento(nuevo_afn, afn)
+        nuevo_afn.agregar_transicion_etiqueta(nuevo_inicio, mapa_estados[afn.start_state], 2 * numero)
+        for estado_final in afn.final_states:
+            nuevo_afn.agregar_transicion_etiqueta(mapa_estados[estado_final], nuevo_fin, 2 * numero + 1)
+
+        nuevo_afn.start_state = nuevo_inicio
+        return nuevo_afn
+
+    def repeticion(self, afn, minimo, maximo):
+        """Repetición acotada: AFN{m}, AFN{m,} (maximo None) o AFN{m,n}"""
+        if self.modo_contador:
+            return self.repeticion_contador(afn, minimo, maximo)
+
+        nuevo_afn = AFN()
+        nuevo_inicio = nuevo_afn.crear_estado()
+        nuevo_fin = nuevo_afn.crear_estado(is_final=True)
+
+        # El operando ya está construido: cada copia solo instancia sus estados
+        actual = nuevo_inicio
+        for _ in range(minimo):
+            actual = self._encadenar_copia(nuevo_afn, actual, afn)
+
+        if maximo is None:
+            # Cola AFN* sobre una sola copia adicional
+            mapa_estados = self._copiar_fragmento(nuevo_afn, afn)
+            inicio_copia = mapa_estados[afn.start_state]
+            nuevo_afn.agregar_transicion(actual, inicio_copia, '#')
+            for estado_final in afn.final_states:
+                nuevo_afn.agregar_transicion(mapa_estados[estado_final], inicio_copia, '#')
+                nuevo_afn.agregar_transicion(mapa_estados[estado_final], nuevo_fin, '#')
+        else:
+            # Copias opcionales anidadas: x(x(x)?)? evita caminos duplicados
+            for _ in range(maximo - minimo):
+                anterior = actual
+                actual = self._encadenar_copia(nuevo_afn, anterior, afn)
+                nuevo_afn.agregar_transicion(anterior, nuevo_fin, '#')
+
+        nuevo_afn.agregar_transicion(actual, nuevo_fin, '#')
+        nuevo_afn.start_state = nuevo_inicio
+        return nuevo_afn
+
+    def _encadenar_copia(self, nuevo_afn, actual, afn):
+        """Agrega una copia de afn después de actual y devuelve el estado de unión siguiente"""
+        mapa_estados = self._copiar_fragmento(nuevo_afn, afn)
+        siguiente = nuevo_afn.crear_estado()
+        nuevo_afn.agregar_transicion(actual, mapa_estados[afn.start_state], '#')
+        for estado_final in afn.final_states:
+            nuevo_afn.agregar_transicion(mapa_estados[estado_final], siguiente, '#')
+        return siguiente
+
+    def repeticion_contador(self, afn, minimo, maximo):
+        """Repetición acotada con contador: el operando se copia una sola vez"""
+        contador = self.siguiente_contador
+        self.siguiente_contador += 1
+
+        nuevo_afn = AFN()
+        nuevo_inicio = nuevo_afn.crear_estado()
+        nuevo_fin = nuevo_afn.crear_estado(is_final=True)
+        nuevo_afn.num_contadores = contador + 1
+
+        if maximo == 0:
+            nuevo_afn.agregar_transicion(nuevo_inicio, nuevo_fin, '#')
+            nuevo_afn.start_state = nuevo_inicio
+            return nuevo_afn
+
+        mapa_estados = self._copiar_fragmento(nuevo_afn, afn)
+        inicio_copia = mapa_estados[afn.start_state]
+
+        # Entrada: contador en 0 iteraciones completas
+        nuevo_afn.agregar_transicion_contador(nuevo_inicio, inicio_copia, 'reiniciar', contador, minimo, maximo)
+        if minimo == 0:
+            nuevo_afn.agregar_transicion(nuevo_inicio, nuevo_fin, '#')
+
+        # Al terminar una iteración: repetir (si cabe otra) o salir (si ya se cumplió el mínimo)
+        for estado_final in afn.final_states:
+            final_copia = mapa_estados[estado_final]
+            nuevo_afn.agregar_transicion_contador(final_copia, inicio_copia, 'repetir', contador, minimo, maximo)
+            nuevo_afn.agregar_transicion_contador(final_copia, nuevo_fin, 'salir', contador, minimo, maximo)
+
+        nuevo_afn.start_state = nuevo_inicio
+        return nuevo_afn
 
     def construir_desde_postfix(self, postfix):
         """Construye AFN desde expresión postfix usando pila"""
@@ -190,22 +307,35 @@ class Thompson:
 
         stack = []
 
-        # Tokenizar la expresión postfix para manejar caracteres escapados
-        tokens = []
-        i = 0
-        while i < len(postfix):
-            if postfix[i] == '\\' and i + 1 < len(postfix):
-                tokens.append(postfix[i:i + 2])
-                i += 2
-            else:
-                tokens.append(postfix[i])
-                i += 1
-
+        tokens = tokenizar_postfix(postfix)
         print(f"Tokens en postfix: {tokens}")
 
+        # Hash-consing: cada subárbol se identifica por (token, ids de sus operandos).
+        # Los fragmentos no se modifican después de construirse (cada operador copia
+        # a sus operandos), así que un subárbol repetido reutiliza el mismo AFN.
+        ids_subarboles = {}
+        fragmentos = []
+        claves = []
+        reutilizados = 0
+        estados_ahorrados = 0
+
         for token in tokens:
             print(f"Procesando token: '{token}'")
 
+            aridad = self._aridad(token)
+            if len(claves) >= aridad:
+                clave = (token,) + tuple(claves[len(claves) - aridad:])
+                if clave in ids_subarboles:
+                    del claves[len(claves) - aridad:]
+                    del stack[len(stack) - aridad:]
+                    id_subarbol = ids_subarboles[clave]
+                    claves.append(id_subarbol)
+                    stack.append(fragmentos[id_subarbol])
+                    reutilizados += 1
+                    estados_ahorrados += len(fragmentos[id_subarbol].states)
+                    print(f"  Subexpresión repetida: reutilizando fragmento #{id_subarbol}")
+                    continue
+
             if token.startswith('\\'):
                 # Caracter escapado
                 resultado = self.crear_simbolo(token)
@@ -254,6 +384,23 @@ class Thompson:
                 stack.append(resultado)
                 print(f"  Opcional aplicado")
 
+            elif PATRON_REPETICION.fullmatch(token):
+                if len(stack) < 1:
+                    raise ValueError("Repetición requiere 1 operando")
+                minimo, maximo = parsear_repeticion(token)
+                afn = stack.pop()
+                resultado = self.repeticion(afn, minimo, maximo)
+                stack.append(resultado)
+                print(f"  Repetición {token} aplicada")
+
+            elif PATRON_GRUPO.fullmatch(token):
+                if len(stack) < 1:
+                    raise ValueError("Grupo requiere 1 operando")
+                afn = stack.pop()
+                resultado = self.grupo(afn, int(token[1:-1]))
+                stack.append(resultado)
+                print(f"  Grupo de captura {token} aplicado")
+
             elif token == '#':  # Epsilon
                 resultado = self.crear_epsilon()
                 stack.append(resultado)
@@ -265,10 +412,35 @@ class Thompson:
                 stack.append(resultado)
                 print(f"  Creado AFN para símbolo '{token}'")
 
+            del claves[len(claves) - aridad:]
+            ids_subarboles[clave] = len(fragmentos)
+            claves.append(len(fragmentos))
+            fragmentos.append(stack[-1])
+
             print(f"  Stack size: {len(stack)}")
 
         if len(stack) != 1:
             raise ValueError(f"Expresión postfix inválida: stack final tiene {len(stack)} elementos")
 
+        self.metricas = {
+            'subexpresiones': len(tokens),
+            'reutilizadas': reutilizados,
+            'tasa_reutilizacion': reutilizados / len(tokens),
+            'estados_ahorrados': estados_ahorrados,
+        }
+        print(f"Subexpresiones reutilizadas: {reutilizados}/{len(tokens)} "
+              f"({self.metricas['tasa_reutilizacion']:.0%}), estados no reconstruidos: {estados_ahorrados}")
+
+        # Un grupo descartado por {0,0} no deja etiquetas, pero sigue numerado
+        stack[0].num_grupos = max((int(token[1:-1]) for token in tokens if PATRON_GRUPO.fullmatch(token)),
+                                  default=0)
         return stack[0]
 
+    def _aridad(self, token):
+        """Cantidad de operandos que toma un token postfix"""
+        if token in ('.', '|'):
+            return 2
+        if token in ('*', '+', '?') or PATRON_REPETICION.fullmatch(token) or PATRON_GRUPO.fullmatch(token):
+            return 1
+        return 0
+
@@ -0,0 +1,60 @@
+import sys
+import json
+import subprocess
+
+# Ruta principal: la CLI por lotes, el servidor y los módulos de coincidencia y gramáticas
+MODULOS_NUCLEO = [
+    "automata", "preprocesamiento", "thompson", "subconjuntos", "minimizacion",
+    "optimizacion_afn", "equivalencia", "producto", "eliminador_epsilon", "gramatica_compacta",
+    "validador_gramaticas", "cache_gramaticas", "gramatica_regular", "earley", "cyk", "ll1",
+    "capturas", "prefiltro", "generador_codigo", "tabla_comprimida", "servidor", "conteo",
+    "aproximado", "exportar", "conjunto_patrones", "principal_lab7",
+]
+# Solo la visualización debe cargarlas
+MODULOS_PESADOS = ("networkx", "matplotlib", "numpy")
+PRESUPUESTO_MS = 150
+
+MEDICION = """
+import sys, time, json
+inicio = time.perf_counter()
+import {modulo}
+tiempo = time.perf_counter() - inicio
+pesados = sorted(m for m in {pesados!r} if m in sys.modules)
+print(json.dumps({{'ms': tiempo * 1000, 'pesados': pesados}}))
+"""
+
+
+def medir_importacion(modulo, repeticiones=5):
+    """Mejor tiempo de importación en un intérprete nuevo y módulos pesados que arrastra"""
+    mejor = None
+    pesados = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, "-c", MEDICION.format(modulo=modulo, pesados=MODULOS_PESADOS)],
+                                capture_output=True, text=True, check=True).stdout
+        medicion = json.loads(salida)
+        mejor = medicion['ms'] if mejor is None else min(mejor, medicion['ms'])
+        pesados = medicion['pesados']
+    return mejor, pesados
+
+
+def benchmark_importacion(modulos=MODULOS_NUCLEO, presupuesto_ms=PRESUPUESTO_MS):
+    """Verifica que la ruta principal importe dentro del presupuesto y sin bibliotecas de gráficos"""
+    print(f"=== TIEMPO DE IMPORTACIÓN (presupuesto {presupuesto_ms} ms) ===")
+    fallidos = []
+    for modulo in modulos:
+        ms, pesados = medir_importacion(modulo)
+        correcto = ms <= presupuesto_ms and not pesados
+        if not correcto:
+            fallidos.append(modulo)
+        extra = f"  carga {', '.join(pesados)}" if pesados else ""
+        print(f"  {'✅' if correcto else '❌'} {modulo:<22} {ms:7.1f} ms{extra}")
+
+    if fallidos:
+        print(f"\nFuera de presupuesto: {', '.join(fallidos)}")
+    else:
+        print("\nTodos los módulos dentro del presupuesto")
+    return not fallidos
+
+
+if __name__ == "__main__":
+    sys.exit(0 if benchmark_importacion() else 1)
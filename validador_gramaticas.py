@@ -1,9 +1,7 @@
 import re
 import sys
 import os
-from preprocesamiento import infix_to_postfix
-from thompson import Thompson
-from subconjuntos import Subconjuntos
+from eliminador_epsilon import Gramatica
 
 
 class ValidadorGramaticas:
@@ -87,3 +85,51 @@ class ValidadorGramaticas:
 
         return len(errores) == 0, errores
         return len(errores) == 0, errores
+
+    def cargar_archivo(self, nombre_archivo, gramatica=None, max_errores=100):
+        """Valida y carga la gramática en una sola pasada sobre el archivo.
+
+        Lee en bloques con búfer y no guarda las líneas válidas: la memoria extra es
+        la de la gramática más a lo sumo max_errores mensajes. Devuelve
+        (es_valido, gramatica, errores).
+        """
+        if not os.path.exists(nombre_archivo):
+            return False, None, [f"El archivo '{nombre_archivo}' no existe"]
+
+        gramatica = gramatica if gramatica is not None else Gramatica()
+        errores = []
+        total_errores = 0
+        producciones = 0
+        linea_num = 0
+        patron = self.patron
+
+        with open(nombre_archivo, 'rb', buffering=1 << 20) as archivo:
+            for linea_num, crudo in enumerate(archivo, 1):
+                try:
+                    linea = crudo.decode('utf-8').strip()
+                except UnicodeDecodeError:
+                    linea = None
+
+                if linea is not None and (not linea or linea.startswith('#')):
+                    continue
+
+                if linea is None or not patron.match(linea):
+                    total_errores += 1
+                    if len(errores) < max_errores:
+                        mensaje = "Codificación inválida" if linea is None else f"Formato de producción inválido - '{linea}'"
+                        errores.append(f"Línea {linea_num}: {mensaje}")
+                    continue
+
+                no_terminal, cuerpo_completo = linea.split('→')
+                no_terminal = no_terminal.strip()
+                for cuerpo in cuerpo_completo.split('|'):
+                    gramatica.agregar_produccion(no_terminal, cuerpo.strip())
+                    producciones += 1
+
+        if total_errores > len(errores):
+            errores.append(f"... y {total_errores - len(errores)} errores más")
+
+        print(f"Archivo {nombre_archivo}: {linea_num} líneas, {producciones} producciones, "
+              f"{total_errores} errores")
+
+        return total_errores == 0, gramatica, errores